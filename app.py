@@ -17,11 +17,15 @@ import schedule
 from data_scheduler import DataScheduler
 import threading
 import subprocess
+import queue
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Union
 
 # Core Flask imports
-from flask import Flask, request, jsonify, send_from_directory, send_file, render_template_string
+from flask import Flask, request, jsonify, send_from_directory, send_file, render_template_string, g, has_request_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
 
@@ -68,6 +72,30 @@ except ImportError:
     AWS_AVAILABLE = False
     print("⚠️  AWS not available. Backup features disabled.")
 
+# System metrics (memory/disk usage in /api/status)
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    print("⚠️  psutil not available. Memory/disk usage will show as unknown.")
+
+# Fast JSON serialization for all API responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("⚠️  orjson not available. Using standard JSON serialization.")
+
+# Shared response cache (falls back to an in-process cache without Redis)
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    print("⚠️  redis not available. Using in-process response cache.")
+
 # Zambian Data Import
 from zambian_data import ZambianMarketData
 print("✅ ZambianMarketData imported successfully")
@@ -76,6 +104,9 @@ print("✅ ZambianMarketData imported successfully")
 # MISSING FORECAST FUNCTIONS (FALLBACK IMPLEMENTATIONS)
 # =========================================================
 
+# Markets compared by the multi-market forecast (overridden by forecast.py when available)
+FORECAST_MARKETS = ("Lusaka", "Kabwe", "Ndola", "Livingstone")
+
 def get_forecast_recommendations(commodity, market):
     """Fallback forecast recommendations function"""
     recommendations = {
@@ -130,10 +161,9 @@ def get_market_forecast(commodity, market, days):
 
 def get_all_markets_forecast(commodity, days):
     """Fallback all markets forecast function"""
-    markets = ["Lusaka", "Kabwe", "Ndola", "Livingstone"]
     results = {}
     
-    for market in markets:
+    for market in FORECAST_MARKETS:
         results[market] = get_market_forecast(commodity, market, days)
     
     return results
@@ -152,6 +182,7 @@ try:
         get_forecast_recommendations,
         analyze_market_forecasts,
         ForecastConfig,
+        FORECAST_MARKETS,
         model_manager
     )
     FORECAST_AVAILABLE = True
@@ -221,6 +252,40 @@ def generate_simple_forecast(current_price, days):
     
     return predictions
 
+# =========================================================
+# CACHING UTILITIES
+# =========================================================
+
+# USSD lookups hit the database on every keypress; prices change at most hourly
+USSD_CACHE_TTL = 60  # seconds
+
+def ttl_cache(seconds):
+    """
+    Cache a function's result per argument tuple for a few seconds
+    None results and raised exceptions are not cached
+    """
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+        
+        @wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(args)
+            if hit and now - hit[0] < seconds:
+                return hit[1]
+            
+            value = func(*args)
+            if value is not None:
+                with lock:
+                    cache[args] = (now, value)
+            return value
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
 # =========================================================
 # SMS & USSD SERVICES
 # =========================================================
@@ -236,14 +301,25 @@ class SMSService:
         self.twilio_auth_token = os.getenv('TWILIO_AUTH_TOKEN', 'demo_token')
         self.twilio_phone = os.getenv('TWILIO_PHONE', '+15005550006')
         
+        # Twilio client is created on the first real send and reused afterwards
+        self._client = None
+        self._client_lock = threading.Lock()
+        
         if TWILIO_AVAILABLE and self.twilio_account_sid != 'demo_sid':
-            self.client = Client(self.twilio_account_sid, self.twilio_auth_token)
             self.active = True
         else:
-            self.client = None
             self.active = False
             print("⚠️  SMS Service: Running in demo mode")
     
+    @property
+    def client(self):
+        """Shared Twilio client (lazily created, one per process)"""
+        if self._client is None and self.active:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = Client(self.twilio_account_sid, self.twilio_auth_token)
+        return self._client
+    
     def send_sms(self, to_phone, message):
         """Send SMS to phone number"""
         try:
@@ -563,7 +639,16 @@ class USSDService:
     def get_commodity_price(self, commodity):
         """Get current price for commodity"""
         try:
-            conn = get_db()
+            return self._commodity_price(commodity)
+        except Exception as e:
+            print(f"Error getting commodity price: {e}")
+            return None
+    
+    @ttl_cache(USSD_CACHE_TTL)
+    def _commodity_price(self, commodity):
+        """Latest prices for a commodity (cached; errors propagate so they aren't cached)"""
+        conn = get_db()
+        try:
             cur = conn.cursor()
             
             # Get latest prices for different markets
@@ -574,59 +659,56 @@ class USSDService:
             ''', (commodity,))
             
             prices = cur.fetchall()
+        finally:
             conn.close()
-            
-            if not prices:
-                return None
-            
-            # Format response
-            result = {}
-            for price in prices:
-                market = price["market"]
-                if "Lusaka" in market:
-                    result["lusaka"] = price["price"]
-                elif "Kabwe" in market:
-                    result["kabwe"] = price["price"]
-                elif "Ndola" in market:
-                    result["ndola"] = price["price"]
-            
-            # Determine trend
-            result["trend"] = "stable"
-            if len(prices) > 1:
-                if prices[0]["price"] > prices[1]["price"]:
-                    result["trend"] = "rising"
-                elif prices[0]["price"] < prices[1]["price"]:
-                    result["trend"] = "falling"
-            
-            return result
-            
-        except Exception as e:
-            print(f"Error getting commodity price: {e}")
+        
+        if not prices:
             return None
+        
+        # Format response
+        result = {}
+        for price in prices:
+            market = price["market"]
+            if "Lusaka" in market:
+                result["lusaka"] = price["price"]
+            elif "Kabwe" in market:
+                result["kabwe"] = price["price"]
+            elif "Ndola" in market:
+                result["ndola"] = price["price"]
+        
+        # Determine trend
+        result["trend"] = "stable"
+        if len(prices) > 1:
+            if prices[0]["price"] > prices[1]["price"]:
+                result["trend"] = "rising"
+            elif prices[0]["price"] < prices[1]["price"]:
+                result["trend"] = "falling"
+        
+        return result
     
     def get_all_prices(self):
         """Get latest prices for all commodities"""
         try:
-            conn = get_db()
-            cur = conn.cursor()
-            
+            return self._all_prices()
+        except Exception as e:
+            print(f"Error getting all prices: {e}")
+            return []
+    
+    @ttl_cache(USSD_CACHE_TTL)
+    def _all_prices(self):
+        """Latest price for each commodity (cached; errors propagate so they aren't cached)"""
+        conn = get_db()
+        try:
             # Get latest price for each commodity
-            cur.execute('''
+            return query_dicts(conn, '''
                 SELECT commodity, price FROM market_prices 
                 WHERE verified=1 
                 GROUP BY commodity 
                 HAVING MAX(recorded_at)
                 LIMIT 6
             ''')
-            
-            prices = [dict(row) for row in cur.fetchall()]
+        finally:
             conn.close()
-            
-            return prices
-            
-        except Exception as e:
-            print(f"Error getting all prices: {e}")
-            return []
     
     def get_maize_forecast(self, days=7):
         """Get maize price forecast"""
@@ -651,23 +733,23 @@ class USSDService:
     def get_buyers(self, commodity):
         """Get buyers for commodity"""
         try:
-            conn = get_db()
-            cur = conn.cursor()
-            
-            cur.execute('''
+            return self._buyers(commodity)
+        except Exception as e:
+            print(f"Error getting buyers: {e}")
+            return []
+    
+    @ttl_cache(USSD_CACHE_TTL)
+    def _buyers(self, commodity):
+        """Top verified buyers for a commodity (cached; errors propagate so they aren't cached)"""
+        conn = get_db()
+        try:
+            return query_dicts(conn, '''
                 SELECT name, phone, location FROM buyers 
                 WHERE commodity=? AND verified=1 
                 ORDER BY rating DESC LIMIT 5
             ''', (commodity,))
-            
-            buyers = [dict(row) for row in cur.fetchall()]
+        finally:
             conn.close()
-            
-            return buyers
-            
-        except Exception as e:
-            print(f"Error getting buyers: {e}")
-            return []
     
     def get_weather_info(self):
         """Get weather information"""
@@ -765,13 +847,8 @@ class BackupManager:
                 }
             }
             
-            # Save manifest
-            manifest_path = os.path.join(self.backup_dir, f"{backup_name}_manifest.json")
-            with open(manifest_path, 'w') as f:
-                json.dump(manifest, f, indent=2)
-            
-            # 5. Create ZIP archive
-            zip_path = self.create_zip_archive(backup_name)
+            # 5. Create ZIP archive (manifest is written straight into the archive)
+            zip_path = self.create_zip_archive(backup_name, manifest)
             
             # 6. Upload to S3 if enabled
             if self.s3_enabled:
@@ -786,7 +863,7 @@ class BackupManager:
                 "success": True,
                 "backup_name": backup_name,
                 "local_path": zip_path,
-                "size": os.path.getsize(zip_path) if os.path.exists(zip_path) else 0
+                "size": get_file_size(zip_path)
             }
             
         except Exception as e:
@@ -822,9 +899,8 @@ class BackupManager:
         try:
             conn = sqlite3.connect('farm_market.db')
             
-            with open(sql_path, 'w') as f:
-                for line in conn.iterdump():
-                    f.write(f'{line}\n')
+            with open(sql_path, 'w', buffering=1024 * 1024) as f:
+                f.writelines(f'{line}\n' for line in conn.iterdump())
             
             conn.close()
             
@@ -841,21 +917,28 @@ class BackupManager:
                 if filename.endswith('.log'):
                     log_files.append(filename)
             
-            # Also include activity logs from database
+            # Also include activity logs from database, streamed straight
+            # from the cursor into the JSON file (one row in memory at a time)
             conn = get_db()
             cur = conn.cursor()
+            cur.row_factory = None
             cur.execute("SELECT * FROM activity_logs ORDER BY created_at DESC LIMIT 1000")
-            activity_logs = [dict(row) for row in cur.fetchall()]
-            conn.close()
+            cols = [d[0] for d in cur.description]
             
-            # Save activity logs
             activity_path = os.path.join(self.backup_dir, f"{backup_name}_activity.json")
+            activity_count = 0
             with open(activity_path, 'w') as f:
-                json.dump(activity_logs, f, indent=2)
+                f.write('[')
+                for row in cur:
+                    f.write(',\n  ' if activity_count else '\n  ')
+                    f.write(json.dumps(dict(zip(cols, row))))
+                    activity_count += 1
+                f.write('\n]' if activity_count else ']')
+            conn.close()
             
             return {
                 "log_files": log_files,
-                "activity_logs": len(activity_logs),
+                "activity_logs": activity_count,
                 "activity_path": activity_path
             }
             
@@ -895,7 +978,7 @@ class BackupManager:
             print(f"Config backup failed: {e}")
             return {"error": str(e)}
     
-    def create_zip_archive(self, backup_name):
+    def create_zip_archive(self, backup_name, manifest=None):
         """Create ZIP archive of backup"""
         try:
             import zipfile
@@ -903,6 +986,9 @@ class BackupManager:
             zip_path = os.path.join(self.backup_dir, f"{backup_name}.zip")
             
             with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                if manifest is not None:
+                    zipf.writestr(f"{backup_name}_manifest.json", json.dumps(manifest, indent=2))
+                
                 # Add all backup files
                 for filename in os.listdir(self.backup_dir):
                     if filename.startswith(backup_name):
@@ -1054,8 +1140,49 @@ class BackupManager:
 APP_SECRET = os.getenv('APP_SECRET', 'mulungushi-secret-key-2024')
 JWT_SECRET = os.getenv('JWT_SECRET', 'jwt-secret-key-farm-market-2024')
 DATABASE = "farm_market.db"
+# GET routes read from this copy (e.g. a replicated/Litestream-restored file); defaults to the primary
+READ_DATABASE = os.getenv('READ_REPLICA_DATABASE', DATABASE)
+REDIS_URL = os.getenv('REDIS_URL')
+# Worker processes serving the app (exported by gunicorn.conf.py; 1 for `python app.py`)
+WEB_WORKERS = int(os.getenv('GUNICORN_WORKERS', 1))
+PRICES_CACHE_TTL = int(os.getenv('PRICES_CACHE_TTL', 60))      # seconds
+FORECAST_CACHE_TTL = int(os.getenv('FORECAST_CACHE_TTL', 300))  # seconds
+# Internal nginx location for backups (e.g. "/protected-backups/"); when set,
+# downloads are handed to nginx with X-Accel-Redirect instead of streamed by Flask
+BACKUP_ACCEL_PREFIX = os.getenv('BACKUP_ACCEL_PREFIX')
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# JSON1 functions (built in since SQLite 3.38, optional before) let /api/prices/real
+# serialize rows inside SQLite
+try:
+    _probe = sqlite3.connect(":memory:")
+    _probe.execute("SELECT json_group_array(json_object('a', 1))")
+    SQLITE_HAS_JSON = True
+except sqlite3.OperationalError:
+    SQLITE_HAS_JSON = False
+finally:
+    _probe.close()
+
+PRICE_JSON_FIELDS = ", ".join(f"'{col}', {col}" for col in (
+    "id", "market", "commodity", "price", "unit", "volume",
+    "quality", "source", "verified", "recorded_at", "region", "price_trend"
+))
 FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
 
+# Public endpoint map reported by /api/status
+ENDPOINTS_MAP = {
+    "auth": ["/api/login", "/api/register", "/api/logout"],
+    "users": ["/api/user/profile", "/api/user/update"],
+    "prices": ["/api/prices/real", "/api/data/collect", "/api/data/status"],
+    "forecast": ["/api/forecast/real", "/api/forecast/multi-market"],
+    "buyers": ["/api/buyers", "/api/buyers/add"],
+    "sms": ["/api/sms/send", "/api/sms/price-alert", "/api/sms/daily-summary"],
+    "ussd": ["/api/ussd/callback", "/api/ussd/register"],
+    "admin": ["/api/admin/stats", "/api/admin/users", "/api/admin/verify-price"],
+    "backup": ["/api/backup/create", "/api/backup/status", "/api/backup/list", "/api/backup/download"],
+    "system": ["/api/status"]
+}
+
 # Ensure frontend directory exists
 if not os.path.exists(FRONTEND_DIR):
     os.makedirs(FRONTEND_DIR)
@@ -1067,6 +1194,11 @@ sms_service = SMSService()
 ussd_service = USSDService()
 backup_manager = BackupManager()
 
+# Static Zambian market totals (computed once - the tables never change at runtime)
+ZAMBIAN_REGION_COUNT = len(zambian_data.ZAMBIAN_MARKETS) if hasattr(zambian_data, 'ZAMBIAN_MARKETS') else 0
+ZAMBIAN_COMMODITY_COUNT = len(zambian_data.COMMODITY_PRICE_RANGES) if hasattr(zambian_data, 'COMMODITY_PRICE_RANGES') else 0
+ZAMBIAN_MARKET_COUNT = sum(len(region["markets"]) for region in zambian_data.ZAMBIAN_MARKETS.values()) if hasattr(zambian_data, 'ZAMBIAN_MARKETS') else 0
+
 # =========================================================
 # DATA SCHEDULER INITIALIZATION
 # =========================================================
@@ -1081,14 +1213,59 @@ except ImportError as e:
     data_scheduler = None
     SCHEDULER_AVAILABLE = False
 
+# Service flags fixed at startup (sms/backup are filled in per request)
+SERVICE_STATUS = {
+    "database": "online",
+    "forecast": "enhanced" if FORECAST_AVAILABLE else "basic",
+    "ussd": "active" if AFRICASTALKING_AVAILABLE else "demo",
+    "scheduler": "active" if SCHEDULER_AVAILABLE else "inactive",
+    "data_collection": "active"
+}
+
 # =========================================================
 # FLASK INIT
 # =========================================================
 
 app = Flask(__name__, static_folder=FRONTEND_DIR, static_url_path='')
 app.secret_key = APP_SECRET
+# Browser caching for frontend assets (HTML pages always revalidate, see below)
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = int(os.getenv('STATIC_MAX_AGE', 3600))
+# Let Apache/lighttpd serve send_file() bodies via X-Sendfile when enabled
+app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE', 'false').lower() == 'true'
 CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
 
+if ORJSON_AVAILABLE:
+    class ORJSONProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson (jsonify, request.json)"""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=self.option, default=self.default).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+        
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(
+                orjson.dumps(obj, option=self.option, default=self.default),
+                mimetype=self.mimetype
+            )
+    
+    app.json = ORJSONProvider(app)
+
+@app.after_request
+def set_html_cache_headers(response):
+    """Make HTML pages revalidate (ETag) while JS/CSS/images use the max-age above"""
+    if response.mimetype == "text/html":
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+def get_json_body():
+    """Parsed JSON object of the request ({} for a missing, malformed or non-object body)"""
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else {}
+
 # =========================================================
 # DATABASE UTILITIES
 # =========================================================
@@ -1098,6 +1275,129 @@ def get_db():
     conn.row_factory = sqlite3.Row
     return conn
 
+def get_request_db():
+    """Get the connection shared by the current request (closed on teardown)"""
+    if "db" not in g:
+        g.db = get_db()
+    return g.db
+
+def get_read_db():
+    """Get the read-only connection shared by the current request (GET routes)"""
+    if "read_db" not in g:
+        conn = sqlite3.connect(f"file:{READ_DATABASE}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        g.read_db = conn
+    return g.read_db
+
+@app.teardown_appcontext
+def close_request_db(exc):
+    """Close the request-scoped connections when the app context ends"""
+    for key in ("db", "read_db"):
+        db = g.pop(key, None)
+        if db is not None:
+            db.close()
+
+def query_dicts(conn, sql, params=()):
+    """Run a SELECT and return rows as dicts (plain tuples zipped with the column list)"""
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(sql, params)
+    cols = tuple(d[0] for d in cur.description)
+    # Iterate the cursor directly so no intermediate list of tuples is built
+    return [dict(zip(cols, row)) for row in cur]
+
+# =========================================================
+# RESPONSE CACHE
+# =========================================================
+
+redis_client = redis.Redis.from_url(REDIS_URL) if REDIS_AVAILABLE and REDIS_URL else None
+# Without Redis each worker would keep its own copy and miss the other workers' invalidations,
+# so the in-process fallback is only used by a single worker
+LOCAL_RESPONSE_CACHE = redis_client is None and WEB_WORKERS == 1
+if redis_client is None and not LOCAL_RESPONSE_CACHE:
+    print("⚠️  Response cache disabled: set REDIS_URL to cache across gunicorn workers")
+_response_cache = {}
+_response_cache_lock = threading.Lock()
+RESPONSE_CACHE_MAX_ENTRIES = 1000
+
+def _cache_get(key):
+    """Get a cached response body (None on miss)"""
+    if redis_client is not None:
+        try:
+            return redis_client.get(key)
+        except Exception as e:
+            print(f"⚠️  Redis cache read failed: {e}")
+            return None
+    
+    if not LOCAL_RESPONSE_CACHE:
+        return None
+    
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+def _cache_set(key, body, ttl):
+    """Store a response body for ttl seconds"""
+    if redis_client is not None:
+        try:
+            redis_client.setex(key, ttl, body)
+        except Exception as e:
+            print(f"⚠️  Redis cache write failed: {e}")
+        return
+    
+    if not LOCAL_RESPONSE_CACHE:
+        return
+    
+    now = time.monotonic()
+    with _response_cache_lock:
+        if len(_response_cache) >= RESPONSE_CACHE_MAX_ENTRIES:
+            for stale_key in [k for k, (expires, _) in _response_cache.items() if expires <= now]:
+                del _response_cache[stale_key]
+            if len(_response_cache) >= RESPONSE_CACHE_MAX_ENTRIES:
+                _response_cache.clear()
+        _response_cache[key] = (now + ttl, body)
+
+def invalidate_response_cache(*prefixes):
+    """Drop cached responses for the given endpoint prefixes after a write"""
+    # The USSD menus keep their own short-lived copies of the same data
+    for cached in (USSDService._commodity_price, USSDService._all_prices, USSDService._buyers):
+        cached.cache_clear()
+    
+    if redis_client is not None:
+        try:
+            for prefix in prefixes:
+                keys = list(redis_client.scan_iter(match=f"{prefix}:*", count=500))
+                if keys:
+                    redis_client.delete(*keys)
+        except Exception as e:
+            print(f"⚠️  Redis cache invalidation failed: {e}")
+        return
+    
+    with _response_cache_lock:
+        for key in [k for k in _response_cache if k.split(":", 1)[0] in prefixes]:
+            del _response_cache[key]
+
+def cached_response(prefix, ttl):
+    """Cache-aside for GET JSON endpoints, keyed by prefix and query args"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            query = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+            key = f"{prefix}:{query}"
+            
+            body = _cache_get(key)
+            if body is not None:
+                return app.response_class(body, mimetype="application/json")
+            
+            response = app.make_response(func(*args, **kwargs))
+            if response.status_code == 200:
+                _cache_set(key, response.get_data(), ttl)
+            return response
+        return wrapper
+    return decorator
+
 def init_db():
     """Initialize database with complete schema"""
     conn = get_db()
@@ -1285,6 +1585,15 @@ def init_db():
             metric_value REAL,
             recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             details TEXT
+        )""",
+        
+        """CREATE TABLE IF NOT EXISTS backup_jobs (
+            job_id TEXT PRIMARY KEY,
+            status TEXT,
+            username TEXT,
+            result TEXT,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP
         )"""
     ]
     
@@ -1294,6 +1603,18 @@ def init_db():
         except Exception as e:
             print(f"⚠️  Table creation error: {e}")
     
+    # Indexes for the commodity filter + recorded_at ordering used by price/forecast queries
+    indexes = [
+        "CREATE INDEX IF NOT EXISTS idx_market_prices_commodity_recorded ON market_prices(commodity, recorded_at)",
+        "CREATE INDEX IF NOT EXISTS idx_market_prices_recorded ON market_prices(recorded_at)"
+    ]
+    
+    for index_sql in indexes:
+        try:
+            cur.execute(index_sql)
+        except Exception as e:
+            print(f"⚠️  Index creation error: {e}")
+    
     # Check if we need to add demo data
     cur.execute("SELECT COUNT(*) as count FROM users")
     if cur.fetchone()[0] == 0:
@@ -1377,28 +1698,29 @@ def init_db():
     if cur.fetchone()[0] == 0:
         print("📊 Adding realistic Zambian market data...")
         prices = zambian_data.fetch_all_sources()
+        now_iso = datetime.now().isoformat()
         
-        for price_data in prices:
-            try:
-                cur.execute("""
-                    INSERT INTO market_prices 
-                    (market, commodity, price, unit, volume, quality, source, verified, recorded_at, region, price_trend)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    price_data.get("market", "Unknown"),
-                    price_data.get("commodity", "Unknown"),
-                    price_data.get("price", 0),
-                    price_data.get("unit", "ZMW/kg"),
-                    price_data.get("volume"),
-                    price_data.get("quality"),
-                    price_data.get("source", "Zambian_Source"),
-                    price_data.get("verified", False),
-                    price_data.get("recorded_at", datetime.now().isoformat()),
-                    price_data.get("region"),
-                    price_data.get("price_trend", "stable")
-                ))
-            except Exception as e:
-                print(f"⚠️  Error adding price: {e}")
+        # One executemany; rows clashing with UNIQUE(market, commodity, recorded_at) are skipped
+        try:
+            cur.executemany("""
+                INSERT OR IGNORE INTO market_prices 
+                (market, commodity, price, unit, volume, quality, source, verified, recorded_at, region, price_trend)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                price_data.get("market", "Unknown"),
+                price_data.get("commodity", "Unknown"),
+                price_data.get("price", 0),
+                price_data.get("unit", "ZMW/kg"),
+                price_data.get("volume"),
+                price_data.get("quality"),
+                price_data.get("source", "Zambian_Source"),
+                price_data.get("verified", False),
+                price_data.get("recorded_at", now_iso),
+                price_data.get("region"),
+                price_data.get("price_trend", "stable")
+            ) for price_data in prices])
+        except Exception as e:
+            print(f"⚠️  Error adding prices: {e}")
     
     # Add demo buyers
     cur.execute("SELECT COUNT(*) as count FROM buyers")
@@ -1517,17 +1839,70 @@ def admin_required(f):
 # LOGGING HELPERS
 # =========================================================
 
-def log_activity(user, action, details):
-    """Log user activity"""
+# Activity/metric rows are queued and written in batches by a background
+# thread so logging never adds a commit to the request path.
+LOG_FLUSH_INTERVAL = 0.5  # seconds
+
+ACTIVITY_LOG_SQL = """
+    INSERT INTO activity_logs (user, action, details, ip_address, created_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+SYSTEM_METRIC_SQL = """
+    INSERT INTO system_metrics (metric_type, metric_value, details)
+    VALUES (?, ?, ?)
+"""
+
+_log_queue = queue.Queue()
+_log_writer_lock = threading.Lock()
+_log_writer_started = False
+
+def flush_log_queue():
+    """Write all queued log rows in a single transaction"""
+    batches = {}
+    try:
+        while True:
+            sql, params = _log_queue.get_nowait()
+            batches.setdefault(sql, []).append(params)
+    except queue.Empty:
+        pass
+    
+    if not batches:
+        return
+    
     try:
         conn = get_db()
-        cur = conn.cursor()
-        cur.execute("""
-            INSERT INTO activity_logs (user, action, details, ip_address, created_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (user, action, details, request.remote_addr, datetime.now().isoformat()))
-        conn.commit()
-        conn.close()
+        try:
+            with conn:
+                for sql, rows in batches.items():
+                    conn.executemany(sql, rows)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error writing queued logs: {e}")
+
+def _log_writer():
+    """Background writer draining the log queue"""
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        flush_log_queue()
+
+def _enqueue_log(sql, params):
+    """Queue a log row, starting the writer thread on first use"""
+    global _log_writer_started
+    if not _log_writer_started:
+        with _log_writer_lock:
+            if not _log_writer_started:
+                threading.Thread(target=_log_writer, daemon=True).start()
+                atexit.register(flush_log_queue)
+                _log_writer_started = True
+    _log_queue.put((sql, params))
+
+def log_activity(user, action, details, ip_address=None):
+    """Log user activity (background jobs pass the ip_address of the request that started them)"""
+    try:
+        if ip_address is None and has_request_context():
+            ip_address = request.remote_addr
+        _enqueue_log(ACTIVITY_LOG_SQL, (user, action, details, ip_address, datetime.now().isoformat()))
     except Exception as e:
         print(f"Activity log error: {e}")
 
@@ -1551,16 +1926,7 @@ def log_collection(source_name, operation, records_collected, status, error_mess
 def log_system_metric(metric_type, metric_value, details=None):
     """Log system metrics for monitoring"""
     try:
-        conn = get_db()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            INSERT INTO system_metrics (metric_type, metric_value, details)
-            VALUES (?, ?, ?)
-        """, (metric_type, metric_value, details))
-        
-        conn.commit()
-        conn.close()
+        _enqueue_log(SYSTEM_METRIC_SQL, (metric_type, metric_value, details))
     except Exception as e:
         print(f"Error logging metric: {e}")
 
@@ -1835,21 +2201,20 @@ def serve_frontend(filename):
 @app.route("/api/login", methods=["POST"])
 def login():
     """User login"""
-    data = request.json
+    data = get_json_body()
     username = data.get("username")
     password = data.get("password")
     
     if not username or not password:
         return jsonify({"error": "Username and password required"}), 400
     
-    conn = get_db()
+    conn = get_request_db()
     cur = conn.cursor()
     
     cur.execute("SELECT * FROM users WHERE username=?", (username,))
     user = cur.fetchone()
     
     if not user:
-        conn.close()
         return jsonify({"error": "User not found"}), 404
     
     # Check password
@@ -1863,7 +2228,6 @@ def login():
             cur.execute("UPDATE users SET last_login=? WHERE user_id=?", 
                        (datetime.now().isoformat(), user["user_id"]))
             conn.commit()
-            conn.close()
             
             log_activity(username, "Login", "User logged into system")
             log_system_metric("user_login", 1, f"user:{username}")
@@ -1894,30 +2258,27 @@ def login():
                 }
             })
         else:
-            conn.close()
             return jsonify({"error": "Invalid password"}), 401
     except Exception as e:
-        conn.close()
         print(f"Login error: {e}")
         return jsonify({"error": "Invalid credentials"}), 401
 
 @app.route("/api/register", methods=["POST"])
 def register():
     """User registration"""
-    data = request.json
+    data = get_json_body()
     required = ["username", "password", "name", "role", "phone"]
     
     for field in required:
         if field not in data:
             return jsonify({"error": f"Missing required field: {field}"}), 400
     
-    conn = get_db()
+    conn = get_request_db()
     cur = conn.cursor()
     
     # Check if username exists
     cur.execute("SELECT username FROM users WHERE username=?", (data["username"],))
     if cur.fetchone():
-        conn.close()
         return jsonify({"error": "Username already exists"}), 400
     
     user_id = str(uuid.uuid4())
@@ -1957,8 +2318,6 @@ def register():
         user_dict = dict(new_user)
         token = create_token(user_dict)
         
-        conn.close()
-        
         log_activity(data["username"], "Registration", "New user registered")
         log_system_metric("user_registration", 1, f"role:{data['role']}")
         
@@ -1984,7 +2343,6 @@ def register():
         })
         
     except Exception as e:
-        conn.close()
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/logout", methods=["POST"])
@@ -2014,37 +2372,38 @@ def collect_zambian_data():
         # Fetch data from all Zambian sources
         prices = zambian_data.fetch_all_sources()
         
-        # Save to database
+        # Save to database (one executemany in one transaction)
         saved_count = 0
-        conn = get_db()
+        conn = get_request_db()
         cur = conn.cursor()
-        
-        for price_data in prices:
-            try:
-                cur.execute("""
-                    INSERT OR REPLACE INTO market_prices 
-                    (market, commodity, price, unit, volume, quality, source, verified, 
-                     recorded_at, region, price_trend)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    price_data.get("market", "Unknown"),
-                    price_data.get("commodity", "Unknown"),
-                    price_data.get("price", 0),
-                    price_data.get("unit", "ZMW/kg"),
-                    price_data.get("volume"),
-                    price_data.get("quality"),
-                    price_data.get("source", "Zambian_Source"),
-                    price_data.get("verified", True),
-                    price_data.get("recorded_at", datetime.now().isoformat()),
-                    price_data.get("region"),
-                    price_data.get("price_trend", "stable")
-                ))
-                saved_count += 1
-            except Exception as e:
-                print(f"⚠️  Error saving price: {e}")
+        now_iso = datetime.now().isoformat()
+        
+        rows = [(
+            price_data.get("market", "Unknown"),
+            price_data.get("commodity", "Unknown"),
+            price_data.get("price", 0),
+            price_data.get("unit", "ZMW/kg"),
+            price_data.get("volume"),
+            price_data.get("quality"),
+            price_data.get("source", "Zambian_Source"),
+            price_data.get("verified", True),
+            price_data.get("recorded_at", now_iso),
+            price_data.get("region"),
+            price_data.get("price_trend", "stable")
+        ) for price_data in prices]
+        try:
+            cur.executemany("""
+                INSERT OR REPLACE INTO market_prices 
+                (market, commodity, price, unit, volume, quality, source, verified, 
+                 recorded_at, region, price_trend)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            saved_count = len(rows)
+        except Exception as e:
+            print(f"⚠️  Error saving prices: {e}")
         
         conn.commit()
-        conn.close()
+        invalidate_response_cache("prices", "forecast")
         
         duration = time.time() - start_time
         
@@ -2083,7 +2442,7 @@ def collect_zambian_data():
 def get_data_status():
     """Get data collection status"""
     try:
-        conn = get_db()
+        conn = get_read_db()
         cur = conn.cursor()
         
         # Get total counts
@@ -2097,21 +2456,19 @@ def get_data_status():
         active_sources = cur.fetchone()[0]
         
         # Get recent collections
-        cur.execute('''
+        recent_logs = query_dicts(conn, '''
             SELECT source_name, status, records_collected, collected_at
             FROM collection_logs 
             ORDER BY collected_at DESC 
             LIMIT 10
         ''')
-        recent_logs = [dict(row) for row in cur.fetchall()]
         
         # Get source statistics
-        cur.execute('''
+        sources = query_dicts(conn, '''
             SELECT name, type, url, enabled, priority, last_updated, success_rate, total_attempts, total_success
             FROM data_sources 
             ORDER BY priority, name
         ''')
-        sources = [dict(row) for row in cur.fetchall()]
         
         # Get data freshness
         cur.execute('''
@@ -2124,8 +2481,6 @@ def get_data_status():
         ''')
         freshness = dict(cur.fetchone())
         
-        conn.close()
-        
         return jsonify({
             "status": "active",
             "total_prices": total_prices,
@@ -2146,9 +2501,10 @@ def get_data_status():
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/prices/real", methods=["GET"])
+@cached_response("prices", PRICES_CACHE_TTL)
 def get_real_prices():
     """Get real Zambian market prices"""
-    conn = get_db()
+    conn = get_read_db()
     cur = conn.cursor()
     
     commodity = request.args.get("commodity", "all")
@@ -2161,7 +2517,9 @@ def get_real_prices():
     if latest_only:
         # Get latest price for each commodity-market pair
         query = '''
-            SELECT mp1.* FROM market_prices mp1
+            SELECT mp1.id, mp1.market, mp1.commodity, mp1.price, mp1.unit, mp1.volume,
+                   mp1.quality, mp1.source, mp1.verified, mp1.recorded_at, mp1.region, mp1.price_trend
+            FROM market_prices mp1
             INNER JOIN (
                 SELECT market, commodity, MAX(recorded_at) as latest
                 FROM market_prices 
@@ -2201,18 +2559,20 @@ def get_real_prices():
         query += " ORDER BY recorded_at DESC LIMIT ?"
         params.append(int(limit))
     
-    cur.execute(query, params)
-    prices = [dict(row) for row in cur.fetchall()]
+    if SQLITE_HAS_JSON:
+        # SQLite builds the JSON array itself, so no Python row objects are created
+        cur.execute(f"SELECT json_group_array(json_object({PRICE_JSON_FIELDS})), COUNT(*) FROM ({query})", params)
+        prices_json, returned = cur.fetchone()
+    else:
+        prices = query_dicts(conn, query, params)
+        prices_json, returned = None, len(prices)
     
     # Get statistics
-    cur.execute("SELECT COUNT(*) FROM market_prices WHERE verified = 1")
-    total_verified = cur.fetchone()[0]
-    
-    cur.execute("SELECT COUNT(DISTINCT market) FROM market_prices WHERE verified = 1")
-    unique_markets = cur.fetchone()[0]
-    
-    cur.execute("SELECT COUNT(DISTINCT commodity) FROM market_prices WHERE verified = 1")
-    unique_commodities = cur.fetchone()[0]
+    cur.execute("""
+        SELECT COUNT(*), COUNT(DISTINCT market), COUNT(DISTINCT commodity)
+        FROM market_prices WHERE verified = 1
+    """)
+    total_verified, unique_markets, unique_commodities = cur.fetchone()
     
     # Get price ranges
     price_ranges = {}
@@ -2225,25 +2585,30 @@ def get_real_prices():
         range_data = cur.fetchone()
         price_ranges[commodity] = dict(range_data)
     
-    conn.close()
-    
-    return jsonify({
-        "prices": prices,
+    payload = {
         "statistics": {
             "total_verified": total_verified,
             "unique_markets": unique_markets,
             "unique_commodities": unique_commodities,
-            "returned": len(prices)
+            "returned": returned
         },
         "price_ranges": price_ranges,
         "timestamp": datetime.now().isoformat()
-    })
+    }
+    
+    if prices_json is None:
+        return jsonify(prices=prices, **payload)
+    
+    # Splice the SQLite-built array in as the first key of the object
+    body = app.json.dumps(payload)
+    return app.response_class(f'{{"prices":{prices_json},{body[1:]}', mimetype="application/json")
 
 # =========================================================
 # FORECAST ROUTES (ENHANCED)
 # =========================================================
 
 @app.route("/api/forecast/real", methods=["GET"])
+@cached_response("forecast", FORECAST_CACHE_TTL)
 def get_real_forecast():
     """Get enhanced forecast using Zambian data"""
     commodity = request.args.get("commodity", "Maize")
@@ -2252,43 +2617,32 @@ def get_real_forecast():
     model_type = request.args.get("model", "auto")
     
     try:
-        # Load historical data
-        conn = get_db()
-        cur = conn.cursor()
+        # Load historical data straight into a DataFrame (built column-wise by pandas)
+        conn = get_read_db()
         
-        cur.execute('''
+        df = pd.read_sql_query('''
             SELECT price, recorded_at, market
             FROM market_prices 
             WHERE commodity = ? AND market LIKE ? AND verified = 1
             ORDER BY recorded_at DESC
             LIMIT 90
-        ''', (commodity, f"%{market}%"))
-        
-        historical_data = cur.fetchall()
-        conn.close()
+        ''', conn, params=(commodity, f"%{market}%"))
         
-        if not historical_data:
+        if df.empty:
             # Try to get any data for the commodity
-            conn = get_db()
-            cur = conn.cursor()
-            cur.execute('''
+            df = pd.read_sql_query('''
                 SELECT price, recorded_at FROM market_prices 
                 WHERE commodity = ? AND verified = 1
                 ORDER BY recorded_at DESC LIMIT 30
-            ''', (commodity,))
-            historical_data = cur.fetchall()
-            conn.close()
+            ''', conn, params=(commodity,))
         
-        if not historical_data:
+        if df.empty:
             return jsonify({
                 "error": f"No historical data found for {commodity}",
                 "forecast": [],
                 "model": "no_data"
             }), 404
         
-        # Convert to DataFrame
-        df = pd.DataFrame([dict(row) for row in historical_data])
-        
         if FORECAST_AVAILABLE:
             # Use enhanced forecast
             forecast_results = enhanced_price_forecast(
@@ -2354,19 +2708,8 @@ def get_multi_market_forecast():
         return jsonify({"error": "Enhanced forecast module not available"}), 501
     
     try:
-        # Get forecasts for major Zambian markets
-        markets = ["Lusaka", "Kabwe", "Ndola", "Livingstone"]
-        results = {}
-        
-        for market in markets:
-            try:
-                forecast = get_market_forecast(commodity, market, days)
-                results[market] = forecast
-            except Exception as e:
-                results[market] = {
-                    "error": str(e),
-                    "market": market
-                }
+        # Get forecasts for major Zambian markets (history loaded in one query)
+        results = get_all_markets_forecast(commodity, days)
         
         # Comparative analysis
         comparative = analyze_market_forecasts(results)
@@ -2393,7 +2736,7 @@ def get_multi_market_forecast():
 def send_sms():
     """Send SMS message"""
     user = request.user
-    data = request.json
+    data = get_json_body()
     
     phone = data.get("phone")
     message = data.get("message")
@@ -2408,14 +2751,13 @@ def send_sms():
     # Check if user has SMS credits or is admin
     if user["role"] != "admin":
         # Rate limiting for non-admin users
-        conn = get_db()
+        conn = get_request_db()
         cur = conn.cursor()
         cur.execute('''
             SELECT COUNT(*) as count FROM sms_history 
             WHERE phone=? AND sent_at > datetime('now', '-1 hour')
         ''', (phone,))
         recent_count = cur.fetchone()["count"]
-        conn.close()
         
         if recent_count >= 5:  # Max 5 SMS per hour
             return jsonify({"error": "Rate limit exceeded. Max 5 SMS per hour."}), 429
@@ -2432,7 +2774,7 @@ def send_sms():
 def send_price_alert():
     """Send price alert SMS to user"""
     user = request.user
-    data = request.json
+    data = get_json_body()
     
     commodity = data.get("commodity")
     market = data.get("market", user.get("location", "Lusaka"))
@@ -2442,7 +2784,7 @@ def send_price_alert():
         return jsonify({"error": "Commodity and price required"}), 400
     
     # Get current price for comparison
-    conn = get_db()
+    conn = get_request_db()
     cur = conn.cursor()
     cur.execute('''
         SELECT price FROM market_prices 
@@ -2451,7 +2793,6 @@ def send_price_alert():
     ''', (commodity, f"%{market}%"))
     
     current_price_data = cur.fetchone()
-    conn.close()
     
     current_price = current_price_data["price"] if current_price_data else 0
     
@@ -2512,7 +2853,7 @@ def ussd_callback():
 @app.route("/api/ussd/register", methods=["POST"])
 def ussd_register():
     """Register USSD PIN for user"""
-    data = request.json
+    data = get_json_body()
     phone = data.get("phone")
     pin = data.get("pin")
     
@@ -2520,7 +2861,7 @@ def ussd_register():
         return jsonify({"error": "Phone and PIN required"}), 400
     
     try:
-        conn = get_db()
+        conn = get_request_db()
         cur = conn.cursor()
         
         # Find user by phone
@@ -2528,13 +2869,11 @@ def ussd_register():
         user = cur.fetchone()
         
         if not user:
-            conn.close()
             return jsonify({"error": "User not found with this phone number"}), 404
         
         # Update USSD PIN
         cur.execute("UPDATE users SET ussd_pin=? WHERE phone=?", (pin, phone))
         conn.commit()
-        conn.close()
         
         # Send confirmation SMS
         if sms_service.active:
@@ -2556,7 +2895,7 @@ def ussd_register():
 @app.route("/api/buyers", methods=["GET"])
 def get_buyers():
     """Get buyer listings"""
-    conn = get_db()
+    conn = get_read_db()
     cur = conn.cursor()
     
     commodity = request.args.get("commodity", "all")
@@ -2590,8 +2929,7 @@ def get_buyers():
     query += " ORDER BY rating DESC, verified DESC LIMIT ?"
     params.append(limit)
     
-    cur.execute(query, params)
-    buyers = [dict(row) for row in cur.fetchall()]
+    buyers = query_dicts(conn, query, params)
     
     # Get statistics
     cur.execute("SELECT COUNT(*) as total FROM buyers WHERE status='active'")
@@ -2603,8 +2941,6 @@ def get_buyers():
     cur.execute("SELECT COUNT(DISTINCT location) as locations FROM buyers WHERE status='active'")
     unique_locations = cur.fetchone()["locations"]
     
-    conn.close()
-    
     return jsonify({
         "buyers": buyers,
         "statistics": {
@@ -2621,14 +2957,14 @@ def get_buyers():
 def add_buyer():
     """Add new buyer"""
     user = request.user
-    data = request.json
+    data = get_json_body()
     
     required = ["name", "phone", "commodity", "location"]
     for field in required:
         if field not in data:
             return jsonify({"error": f"Missing required field: {field}"}), 400
     
-    conn = get_db()
+    conn = get_request_db()
     cur = conn.cursor()
     
     try:
@@ -2653,7 +2989,6 @@ def add_buyer():
         
         conn.commit()
         buyer_id = cur.lastrowid
-        conn.close()
         
         log_activity(user["username"], "Added buyer", 
                     f"{data['name']} ({data['commodity']})")
@@ -2665,7 +3000,6 @@ def add_buyer():
         })
         
     except Exception as e:
-        conn.close()
         return jsonify({"error": str(e)}), 500
 
 # =========================================================
@@ -2678,7 +3012,7 @@ def get_user_profile():
     """Get user profile"""
     user = request.user
     
-    conn = get_db()
+    conn = get_read_db()
     cur = conn.cursor()
     
     cur.execute("""
@@ -2689,7 +3023,6 @@ def get_user_profile():
     """, (user["user_id"],))
     
     profile = cur.fetchone()
-    conn.close()
     
     if not profile:
         return jsonify({"error": "Profile not found"}), 404
@@ -2701,7 +3034,7 @@ def get_user_profile():
     days_active = (datetime.now() - created).days
     
     # Get user activity stats
-    conn = get_db()
+    conn = get_read_db()
     cur = conn.cursor()
     cur.execute("SELECT COUNT(*) FROM price_alerts WHERE user_id=?", (user["user_id"],))
     price_alerts = cur.fetchone()[0] or 0
@@ -2709,8 +3042,6 @@ def get_user_profile():
     cur.execute("SELECT COUNT(*) FROM activity_logs WHERE user=?", (user["username"],))
     total_activities = cur.fetchone()[0] or 0
     
-    conn.close()
-    
     # Remove sensitive data
     del profile_dict["ussd_pin"]
     if "password_hash" in profile_dict:
@@ -2731,9 +3062,9 @@ def get_user_profile():
 def update_user_profile():
     """Update user profile"""
     user = request.user
-    data = request.json
+    data = get_json_body()
     
-    conn = get_db()
+    conn = get_request_db()
     cur = conn.cursor()
     
     try:
@@ -2751,7 +3082,6 @@ def update_user_profile():
                 params.append(data[field])
         
         if not update_fields:
-            conn.close()
             return jsonify({"error": "No fields to update"}), 400
         
         # Add user_id to params
@@ -2759,16 +3089,19 @@ def update_user_profile():
         
         # Execute update
         query = f"UPDATE users SET {', '.join(update_fields)} WHERE user_id = ?"
-        cur.execute(query, params)
-        conn.commit()
-        
-        # Get updated user
-        cur.execute("SELECT * FROM users WHERE user_id=?", (user["user_id"],))
-        updated_user = cur.fetchone()
+        if SQLITE_HAS_RETURNING:
+            cur.execute(query + " RETURNING *", params)
+            updated_user = cur.fetchone()
+            conn.commit()
+        else:
+            cur.execute(query, params)
+            conn.commit()
+            
+            # Get updated user
+            cur.execute("SELECT * FROM users WHERE user_id=?", (user["user_id"],))
+            updated_user = cur.fetchone()
         user_dict = dict(updated_user)
         
-        conn.close()
-        
         log_activity(user["username"], "Update profile", f"Updated {len(update_fields)} fields")
         
         # Remove sensitive data
@@ -2783,67 +3116,72 @@ def update_user_profile():
         })
         
     except Exception as e:
-        conn.close()
         return jsonify({"error": str(e)}), 500
 
 # =========================================================
 # ADMIN ROUTES
 # =========================================================
 
+# One aggregate per table; the three run concurrently on read-only connections
+USERS_AGG_SQL = """
+    SELECT COUNT(*),
+           COALESCE(SUM(role='farmer'), 0),
+           COALESCE(SUM(role='trader'), 0),
+           COALESCE(SUM(created_at > date('now', '-1 day')), 0)
+    FROM users
+"""
+PRICES_AGG_SQL = """
+    SELECT COUNT(*),
+           COALESCE(SUM(verified=1), 0),
+           COALESCE(SUM(recorded_at > datetime('now', '-1 day')), 0)
+    FROM market_prices
+"""
+SMS_AGG_SQL = """
+    SELECT COUNT(*),
+           COALESCE(SUM(sent_at > datetime('now', '-1 day')), 0)
+    FROM sms_history
+"""
+
+_stats_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="admin-stats")
+
+def _query_one_readonly(sql):
+    """Run a single-row query on a short-lived read-only connection"""
+    conn = sqlite3.connect(f"file:{READ_DATABASE}?mode=ro", uri=True)
+    try:
+        return conn.execute(sql).fetchone()
+    finally:
+        conn.close()
+
 @app.route("/api/admin/stats", methods=["GET"])
 @admin_required
 def get_admin_stats():
     """Get admin statistics"""
     try:
-        conn = get_db()
-        cur = conn.cursor()
-        
-        # User statistics
-        cur.execute("SELECT COUNT(*) as total FROM users")
-        total_users = cur.fetchone()["total"]
-        
-        cur.execute("SELECT COUNT(*) as farmers FROM users WHERE role='farmer'")
-        total_farmers = cur.fetchone()["farmers"]
-        
-        cur.execute("SELECT COUNT(*) as traders FROM users WHERE role='trader'")
-        total_traders = cur.fetchone()["traders"]
-        
-        cur.execute("SELECT COUNT(*) as today FROM users WHERE created_at > date('now', '-1 day')")
-        new_today = cur.fetchone()["today"]
-        
-        # Price statistics
-        cur.execute("SELECT COUNT(*) as total FROM market_prices")
-        total_prices = cur.fetchone()["total"]
-        
-        cur.execute("SELECT COUNT(*) as verified FROM market_prices WHERE verified=1")
-        verified_prices = cur.fetchone()["verified"]
-        
-        cur.execute("SELECT COUNT(*) as today FROM market_prices WHERE recorded_at > datetime('now', '-1 day')")
-        prices_today = cur.fetchone()["today"]
-        
-        # SMS statistics
-        cur.execute("SELECT COUNT(*) as total FROM sms_history")
-        total_sms = cur.fetchone()["total"]
+        conn = get_read_db()
+        
+        # User, price and SMS statistics (independent tables - run in parallel)
+        if sqlite3.threadsafety > 0:
+            f_users = _stats_executor.submit(_query_one_readonly, USERS_AGG_SQL)
+            f_prices = _stats_executor.submit(_query_one_readonly, PRICES_AGG_SQL)
+            f_sms = _stats_executor.submit(_query_one_readonly, SMS_AGG_SQL)
+            users_row, prices_row, sms_row = f_users.result(), f_prices.result(), f_sms.result()
+        else:
+            users_row = conn.execute(USERS_AGG_SQL).fetchone()
+            prices_row = conn.execute(PRICES_AGG_SQL).fetchone()
+            sms_row = conn.execute(SMS_AGG_SQL).fetchone()
         
-        cur.execute("SELECT COUNT(*) as today FROM sms_history WHERE sent_at > datetime('now', '-1 day')")
-        sms_today = cur.fetchone()["today"]
+        total_users, total_farmers, total_traders, new_today = users_row
+        total_prices, verified_prices, prices_today = prices_row
+        total_sms, sms_today = sms_row
         
         # System metrics
-        cur.execute("SELECT metric_type, metric_value FROM system_metrics ORDER BY recorded_at DESC LIMIT 10")
-        recent_metrics = [dict(row) for row in cur.fetchall()]
+        recent_metrics = query_dicts(conn, "SELECT metric_type, metric_value FROM system_metrics ORDER BY recorded_at DESC LIMIT 10")
         
         # Recent activity
-        cur.execute("SELECT * FROM activity_logs ORDER BY created_at DESC LIMIT 20")
-        recent_activity = [dict(row) for row in cur.fetchall()]
+        recent_activity = query_dicts(conn, "SELECT * FROM activity_logs ORDER BY created_at DESC LIMIT 20")
         
         # Data source status
-        cur.execute("SELECT name, enabled, last_updated, success_rate FROM data_sources ORDER BY priority")
-        data_sources = [dict(row) for row in cur.fetchall()]
-        
-        conn.close()
-        
-        zambian_markets_count = len(zambian_data.ZAMBIAN_MARKETS) if hasattr(zambian_data, 'ZAMBIAN_MARKETS') else 0
-        zambian_commodities_count = len(zambian_data.COMMODITY_PRICE_RANGES) if hasattr(zambian_data, 'COMMODITY_PRICE_RANGES') else 0
+        data_sources = query_dicts(conn, "SELECT name, enabled, last_updated, success_rate FROM data_sources ORDER BY priority")
         
         return jsonify({
             "users": {
@@ -2858,8 +3196,8 @@ def get_admin_stats():
                 "verified": verified_prices,
                 "verification_rate": f"{(verified_prices/total_prices*100):.1f}%" if total_prices > 0 else "0%",
                 "today": prices_today,
-                "unique_commodities": zambian_commodities_count,
-                "unique_markets": sum(len(region["markets"]) for region in zambian_data.ZAMBIAN_MARKETS.values()) if hasattr(zambian_data, 'ZAMBIAN_MARKETS') else 0
+                "unique_commodities": ZAMBIAN_COMMODITY_COUNT,
+                "unique_markets": ZAMBIAN_MARKET_COUNT
             },
             "sms": {
                 "total": total_sms,
@@ -2871,14 +3209,14 @@ def get_admin_stats():
                 "ussd_available": AFRICASTALKING_AVAILABLE,
                 "scheduler_available": SCHEDULER_AVAILABLE,
                 "backup_enabled": backup_manager.s3_enabled,
-                "database_size": os.path.getsize(DATABASE) if os.path.exists(DATABASE) else 0,
+                "database_size": get_file_size(DATABASE),
                 "uptime": get_system_uptime()
             },
             "recent_metrics": recent_metrics,
             "recent_activity": recent_activity[:5],
             "data_sources": data_sources,
             "zambian_data": {
-                "regions": zambian_markets_count,
+                "regions": ZAMBIAN_REGION_COUNT,
                 "sources_active": len([s for s in data_sources if s["enabled"]]),
                 "last_collection": data_sources[0]["last_updated"] if data_sources else None
             }
@@ -2891,48 +3229,51 @@ def get_admin_stats():
 @admin_required
 def get_all_users():
     """Get all users (admin only)"""
-    conn = get_db()
-    cur = conn.cursor()
+    conn = get_read_db()
     
     try:
-        cur.execute("""
+        users = query_dicts(conn, """
             SELECT user_id, username, name, role, phone, email, location, 
                    created_at, last_login, status, sms_alerts
             FROM users 
             ORDER BY created_at DESC
         """)
-        users = [dict(row) for row in cur.fetchall()]
-        conn.close()
         
         return jsonify(users)
         
     except Exception as e:
-        conn.close()
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/admin/verify-price", methods=["POST"])
 @admin_required
 def verify_price():
     """Verify/approve price (admin only)"""
-    data = request.json
+    data = get_json_body()
     price_id = data.get("price_id")
     approve = data.get("approve", True)
     
     if not price_id:
         return jsonify({"error": "Price ID required"}), 400
     
-    conn = get_db()
+    conn = get_request_db()
     cur = conn.cursor()
     
     try:
-        cur.execute("UPDATE market_prices SET verified=? WHERE id=?", (1 if approve else 0, price_id))
-        conn.commit()
-        
-        # Get price details for logging
-        cur.execute("SELECT commodity, price, market FROM market_prices WHERE id=?", (price_id,))
-        price = cur.fetchone()
+        if SQLITE_HAS_RETURNING:
+            # Update and fetch the price details for logging in one statement
+            cur.execute("UPDATE market_prices SET verified=? WHERE id=? RETURNING commodity, price, market",
+                        (1 if approve else 0, price_id))
+            price = cur.fetchone()
+            conn.commit()
+        else:
+            cur.execute("UPDATE market_prices SET verified=? WHERE id=?", (1 if approve else 0, price_id))
+            conn.commit()
+            
+            # Get price details for logging
+            cur.execute("SELECT commodity, price, market FROM market_prices WHERE id=?", (price_id,))
+            price = cur.fetchone()
         
-        conn.close()
+        invalidate_response_cache("prices", "forecast")
         
         if price:
             log_activity(request.user["username"], "Verify price", 
@@ -2944,32 +3285,117 @@ def verify_price():
         })
         
     except Exception as e:
-        conn.close()
         return jsonify({"error": str(e)}), 500
 
 # =========================================================
 # BACKUP ROUTES
 # =========================================================
 
+# Backups run on one background worker so the request thread is never blocked. Job state
+# lives in the backup_jobs table, so any gunicorn worker can answer the status polls
+BACKUP_JOBS_MAX = 50
+BACKUP_JOB_TIMEOUT = 3600  # seconds; a job still 'running' after this died with its worker
+_backup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backup")
+
+def _backup_job_cutoff():
+    """Start time before which a 'running' backup job is considered dead"""
+    return (datetime.now() - timedelta(seconds=BACKUP_JOB_TIMEOUT)).isoformat()
+
+def _finish_backup_job(job_id, result):
+    """Record a backup job's outcome"""
+    conn = get_db()
+    try:
+        conn.execute("""
+            UPDATE backup_jobs SET status = ?, result = ?, finished_at = ? 
+            WHERE job_id = ?
+        """, ("completed" if result["success"] else "failed", json.dumps(result, default=str),
+              datetime.now().isoformat(), job_id))
+        conn.commit()
+    except Exception as e:
+        print(f"⚠️  Could not record backup job {job_id}: {e}")
+    finally:
+        conn.close()
+
+def _run_backup_job(job_id, username, ip_address):
+    """Create a backup and record it (runs on the backup worker)"""
+    try:
+        result = backup_manager.create_backup()
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+    if result["success"]:
+        log_activity(username, "Create backup", 
+                    f"Backup: {result['backup_name']}, Size: {result.get('size', 0)} bytes",
+                    ip_address=ip_address)
+        log_system_metric("backup_created", 1, f"size:{result.get('size', 0)}")
+    _finish_backup_job(job_id, result)
+    return result
+
 @app.route("/api/backup/create", methods=["POST"])
 @admin_required
 def create_backup():
-    """Create system backup (admin only)"""
+    """Start a system backup in the background (admin only)"""
     try:
-        result = backup_manager.create_backup()
+        conn = get_db()
+        try:
+            # Write lock first, so parallel clicks on any worker agree on one running job
+            conn.execute("BEGIN IMMEDIATE")
+            running = conn.execute("""
+                SELECT job_id FROM backup_jobs 
+                WHERE status = 'running' AND started_at > ? 
+                ORDER BY started_at DESC LIMIT 1
+            """, (_backup_job_cutoff(),)).fetchone()
+            if running:
+                # Reuse the job already in progress instead of queueing a duplicate
+                conn.commit()
+                return jsonify({"job_id": running[0], "status": "running"}), 202
+            
+            job_id = uuid.uuid4().hex
+            conn.execute("""
+                INSERT INTO backup_jobs (job_id, status, username, started_at) 
+                VALUES (?, 'running', ?, ?)
+            """, (job_id, request.user["username"], datetime.now().isoformat()))
+            
+            # Forget the oldest jobs
+            conn.execute("""
+                DELETE FROM backup_jobs WHERE job_id NOT IN (
+                    SELECT job_id FROM backup_jobs ORDER BY started_at DESC LIMIT ?
+                )
+            """, (BACKUP_JOBS_MAX,))
+            conn.commit()
+        finally:
+            conn.close()
         
-        if result["success"]:
-            log_activity(request.user["username"], "Create backup", 
-                        f"Backup: {result['backup_name']}, Size: {result.get('size', 0)} bytes")
-            log_system_metric("backup_created", 1, f"size:{result.get('size', 0)}")
-            
-            return jsonify(result)
-        else:
-            return jsonify(result), 500
+        _backup_executor.submit(_run_backup_job, job_id, request.user["username"],
+                                request.remote_addr)
+        return jsonify({"job_id": job_id, "status": "running"}), 202
             
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/backup/status/<job_id>", methods=["GET"])
+@admin_required
+def backup_status(job_id):
+    """Poll a background backup job (admin only)"""
+    conn = get_db()
+    try:
+        job = conn.execute(
+            "SELECT status, result, started_at FROM backup_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+    
+    if job is None:
+        return jsonify({"error": "Backup job not found"}), 404
+    
+    status, result, started_at = job
+    if status == "running":
+        if started_at > _backup_job_cutoff():
+            return jsonify({"job_id": job_id, "status": "running"}), 202
+        return jsonify({"job_id": job_id, "status": "failed", "error": "Backup job timed out"}), 500
+    
+    result = dict(json.loads(result) if result else {}, job_id=job_id, status=status)
+    return jsonify(result), 200 if status == "completed" else 500
+
 @app.route("/api/backup/list", methods=["GET"])
 @admin_required
 def list_backups():
@@ -2983,16 +3409,19 @@ def list_backups():
                     filepath = os.path.join(backup_manager.backup_dir, filename)
                     stats = os.stat(filepath)
                     
-                    backups.append({
+                    backups.append((stats.st_mtime, {
                         "name": filename,
                         "path": filepath,
                         "size": stats.st_size,
                         "created": datetime.fromtimestamp(stats.st_mtime).isoformat(),
                         "download_url": f"/api/backup/download/{filename}"
-                    })
+                    }))
+        
+        # Sort on the raw mtime rather than re-comparing ISO strings
+        backups.sort(key=lambda item: item[0], reverse=True)
         
         return jsonify({
-            "backups": sorted(backups, key=lambda x: x["created"], reverse=True),
+            "backups": [backup for _, backup in backups],
             "backup_dir": backup_manager.backup_dir,
             "max_backups": backup_manager.max_backups,
             "s3_enabled": backup_manager.s3_enabled
@@ -3006,14 +3435,28 @@ def list_backups():
 def download_backup(filename):
     """Download backup file (admin only)"""
     try:
+        filename = os.path.basename(filename)
         filepath = os.path.join(backup_manager.backup_dir, filename)
         
-        if not os.path.exists(filepath):
+        if not os.path.isfile(filepath):
             return jsonify({"error": "Backup file not found"}), 404
         
         log_activity(request.user["username"], "Download backup", f"File: {filename}")
         
-        return send_file(filepath, as_attachment=True)
+        if BACKUP_ACCEL_PREFIX:
+            # nginx streams the file itself; nothing passes through Python
+            response = app.response_class(mimetype="application/zip")
+            response.headers["X-Accel-Redirect"] = BACKUP_ACCEL_PREFIX.rstrip("/") + "/" + filename
+            response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+            # Whole-database archive: never store it in shared proxies or CDNs
+            response.headers["Cache-Control"] = "private, no-store"
+            return response
+        
+        # Zip is already compressed: send as-is with Content-Length, ETag and Range support
+        response = send_file(filepath, mimetype="application/zip", as_attachment=True,
+                             download_name=filename, conditional=True, max_age=0)
+        response.headers["Cache-Control"] = "private, no-store"
+        return response
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -3026,7 +3469,7 @@ def download_backup(filename):
 def status():
     """Check API status with detailed system info"""
     try:
-        conn = get_db()
+        conn = get_read_db()
         cur = conn.cursor()
         
         # Database stats
@@ -3042,41 +3485,32 @@ def status():
         cur.execute("SELECT COUNT(*) FROM users WHERE status='active'")
         active_users = cur.fetchone()[0] or 0
         
-        conn.close()
+        now_iso = datetime.now().isoformat()
         
         # System info
         system_info = {
             "platform": sys.platform,
             "python_version": sys.version.split()[0],
             "flask_version": "2.3.3",
-            "server_time": datetime.now().isoformat(),
+            "server_time": now_iso,
             "uptime": get_system_uptime(),
             "memory_usage": get_memory_usage(),
             "disk_usage": get_disk_usage()
         }
         
         # Service status
-        service_status = {
-            "database": "online",
-            "forecast": "enhanced" if FORECAST_AVAILABLE else "basic",
-            "sms": "active" if sms_service.active else "demo",
-            "ussd": "active" if AFRICASTALKING_AVAILABLE else "demo",
-            "scheduler": "active" if SCHEDULER_AVAILABLE else "inactive",
-            "backup": "enabled" if backup_manager.s3_enabled else "local_only",
-            "data_collection": "active"
-        }
+        service_status = dict(SERVICE_STATUS,
+                              sms="active" if sms_service.active else "demo",
+                              backup="enabled" if backup_manager.s3_enabled else "local_only")
         
         # Zambian data status
-        zambian_markets_count = len(zambian_data.ZAMBIAN_MARKETS) if hasattr(zambian_data, 'ZAMBIAN_MARKETS') else 0
-        zambian_commodities_count = len(zambian_data.COMMODITY_PRICE_RANGES) if hasattr(zambian_data, 'COMMODITY_PRICE_RANGES') else 0
-        
         zambian_status = {
             "verified_prices": verified_prices,
             "commodities_tracked": commodities,
             "markets_monitored": markets,
             "active_users": active_users,
-            "regions_covered": zambian_markets_count,
-            "last_updated": datetime.now().isoformat()
+            "regions_covered": ZAMBIAN_REGION_COUNT,
+            "last_updated": now_iso
         }
         
         return jsonify({
@@ -3085,18 +3519,7 @@ def status():
             "system": system_info,
             "services": service_status,
             "zambian_data": zambian_status,
-            "endpoints": {
-                "auth": ["/api/login", "/api/register", "/api/logout"],
-                "users": ["/api/user/profile", "/api/user/update"],
-                "prices": ["/api/prices/real", "/api/data/collect", "/api/data/status"],
-                "forecast": ["/api/forecast/real", "/api/forecast/multi-market"],
-                "buyers": ["/api/buyers", "/api/buyers/add"],
-                "sms": ["/api/sms/send", "/api/sms/price-alert", "/api/sms/daily-summary"],
-                "ussd": ["/api/ussd/callback", "/api/ussd/register"],
-                "admin": ["/api/admin/stats", "/api/admin/users", "/api/admin/verify-price"],
-                "backup": ["/api/backup/create", "/api/backup/list", "/api/backup/download"],
-                "system": ["/api/status"]
-            }
+            "endpoints": ENDPOINTS_MAP
         })
     except Exception as e:
         return jsonify({
@@ -3105,6 +3528,13 @@ def status():
             "timestamp": datetime.now().isoformat()
         })
 
+def get_file_size(path):
+    """Get file size in bytes with a single stat call (0 if missing)"""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
 def get_system_uptime():
     """Get system uptime (simplified)"""
     try:
@@ -3113,20 +3543,24 @@ def get_system_uptime():
     except:
         return "unknown"
 
+@ttl_cache(5)
 def get_memory_usage():
-    """Get memory usage (simplified)"""
+    """Get memory usage (cached for 5 seconds)"""
+    if not PSUTIL_AVAILABLE:
+        return "unknown"
     try:
-        import psutil
         return f"{psutil.virtual_memory().percent}%"
-    except:
+    except Exception:
         return "unknown"
 
+@ttl_cache(5)
 def get_disk_usage():
-    """Get disk usage (simplified)"""
+    """Get disk usage (cached for 5 seconds)"""
+    if not PSUTIL_AVAILABLE:
+        return "unknown"
     try:
-        import psutil
         return f"{psutil.disk_usage('/').percent}%"
-    except:
+    except Exception:
         return "unknown"
 
 # =========================================================
@@ -3144,32 +3578,34 @@ def schedule_tasks():
                 prices = zambian_data.fetch_all_sources()
                 
                 saved_count = 0
+                collected_at = datetime.now().isoformat()
                 conn = get_db()
                 cur = conn.cursor()
                 
-                for price_data in prices:
-                    try:
-                        cur.execute("""
-                            INSERT OR REPLACE INTO market_prices 
-                            (market, commodity, price, unit, volume, quality, source, verified, recorded_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            price_data.get("market", "Unknown"),
-                            price_data.get("commodity", "Unknown"),
-                            price_data.get("price", 0),
-                            price_data.get("unit", "ZMW/kg"),
-                            price_data.get("volume"),
-                            price_data.get("quality"),
-                            price_data.get("source", "Zambian_Source"),
-                            price_data.get("verified", True),
-                            price_data.get("recorded_at", datetime.now().isoformat())
-                        ))
-                        saved_count += 1
-                    except Exception as e:
-                        print(f"⚠️  Error saving price: {e}")
+                rows = [(
+                    price_data.get("market", "Unknown"),
+                    price_data.get("commodity", "Unknown"),
+                    price_data.get("price", 0),
+                    price_data.get("unit", "ZMW/kg"),
+                    price_data.get("volume"),
+                    price_data.get("quality"),
+                    price_data.get("source", "Zambian_Source"),
+                    price_data.get("verified", True),
+                    price_data.get("recorded_at", collected_at)
+                ) for price_data in prices]
+                try:
+                    cur.executemany("""
+                        INSERT OR REPLACE INTO market_prices 
+                        (market, commodity, price, unit, volume, quality, source, verified, recorded_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, rows)
+                    saved_count = len(rows)
+                except Exception as e:
+                    print(f"⚠️  Error saving prices: {e}")
                 
                 conn.commit()
                 conn.close()
+                invalidate_response_cache("prices", "forecast")
                 
                 log_collection(
                     source_name="Scheduled_Zambian_Data",
@@ -3223,16 +3659,20 @@ def schedule_tasks():
         except Exception as e:
             print(f"❌ Daily SMS summaries failed: {e}")
     
+    def hourly_price_check():
+        """Hourly price check during market hours (08:30 - 17:30)"""
+        now = datetime.now()
+        if not 8 <= now.hour < 18:
+            return
+        print(f"⏰ Hourly price check at {now.hour}:30")
+    
     # Schedule tasks
     schedule.every().day.at("08:00").do(daily_data_collection)
     schedule.every().day.at("02:00").do(daily_backup)
     schedule.every().day.at("07:00").do(send_daily_sms_summaries)
     
     # Hourly price updates (market hours)
-    for hour in range(8, 18):
-        schedule.every().day.at(f"{hour:02d}:30").do(
-            lambda: print(f"⏰ Hourly price check at {hour}:30")
-        )
+    schedule.every().hour.at(":30").do(hourly_price_check)
     
     print("✅ Scheduled tasks configured")
     
@@ -3297,12 +3737,9 @@ def print_startup_banner():
     print("🖥️  Frontend: http://127.0.0.1:5000")
     print("=" * 70)
     print("🇿🇲 ZAMBIAN DATA INTEGRATION:")
-    zambian_markets_count = len(zambian_data.ZAMBIAN_MARKETS) if hasattr(zambian_data, 'ZAMBIAN_MARKETS') else 0
-    zambian_commodities_count = len(zambian_data.COMMODITY_PRICE_RANGES) if hasattr(zambian_data, 'COMMODITY_PRICE_RANGES') else 0
-    zambian_total_markets = sum(len(region["markets"]) for region in zambian_data.ZAMBIAN_MARKETS.values()) if hasattr(zambian_data, 'ZAMBIAN_MARKETS') else 0
-    print(f"   • {zambian_markets_count} regions")
-    print(f"   • {zambian_commodities_count} commodities")
-    print(f"   • {zambian_total_markets} markets")
+    print(f"   • {ZAMBIAN_REGION_COUNT} regions")
+    print(f"   • {ZAMBIAN_COMMODITY_COUNT} commodities")
+    print(f"   • {ZAMBIAN_MARKET_COUNT} markets")
     print("=" * 70)
     print("🔑 DEMO LOGIN CREDENTIALS:")
     print("   Farmer: farmer1 / farmer123")
@@ -1,9 +1,22 @@
 import os  # Add this line
 import json
+import gzip
+import io
+import shutil
+import subprocess
+import tempfile
 import boto3
+from boto3.s3.transfer import TransferConfig
 from datetime import datetime
-import schedule
-import threading
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+# Multipart, multi-threaded S3 uploads for anything over 8 MiB
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    use_threads=True
+)
 
 class BackupManager:
     
@@ -27,23 +40,56 @@ class BackupManager:
             "timestamp": timestamp
         }
         
+        # Compress once in memory; the same bytes are saved locally and uploaded
+        body = gzip.compress(json.dumps(backup_data, separators=(',', ':')).encode('utf-8'))
+        
         # Save locally
-        backup_file = f"backups/backup_{timestamp}.json"
-        with open(backup_file, 'w') as f:
-            json.dump(backup_data, f)
+        backup_file = f"backups/backup_{timestamp}.json.gz"
+        with open(backup_file, 'wb') as f:
+            f.write(body)
         
         # Upload to S3
-        self.s3_client.upload_file(backup_file, self.bucket_name, f"backups/{timestamp}.json")
+        self.s3_client.upload_fileobj(io.BytesIO(body), self.bucket_name, f"backups/{timestamp}.json.gz",
+                                      ExtraArgs={"ContentType": "application/json", "ContentEncoding": "gzip"},
+                                      Config=S3_TRANSFER_CONFIG)
         
         # Database dump (MySQL)
-        os.system(f"mysqldump -u root farmers_db > backups/db_{timestamp}.sql")
+        self.dump_database(timestamp)
         
         print(f"Backup created: {timestamp}")
         return backup_file
     
+    def dump_database(self, timestamp):
+        """Pipe mysqldump through gzip straight to S3 (no intermediate .sql file)"""
+        s3_key = f"backups/db_{timestamp}.sql.gz"
+        dump = subprocess.Popen(['mysqldump', '-u', 'root', 'farmers_db'],
+                                stdout=subprocess.PIPE, bufsize=1 << 20)
+        
+        try:
+            # Compressed dump stays in memory up to 64 MiB, then spills to a temp file
+            with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024) as buf:
+                with gzip.GzipFile(fileobj=buf, mode='wb') as gz:
+                    shutil.copyfileobj(dump.stdout, gz, length=1 << 20)
+                dump.stdout.close()
+                
+                if dump.wait() != 0:
+                    raise RuntimeError(f"mysqldump failed with exit code {dump.returncode}")
+                
+                buf.seek(0)
+                self.s3_client.upload_fileobj(buf, self.bucket_name, s3_key, Config=S3_TRANSFER_CONFIG)
+        finally:
+            # A failed write or upload must not leave mysqldump blocked on a full pipe
+            if dump.poll() is None:
+                dump.kill()
+            dump.stdout.close()
+            dump.wait()
+        
+        return s3_key
+    
     def restore_backup(self, backup_file):
         """Restore from backup file"""
-        with open(backup_file, 'r') as f:
+        opener = gzip.open if backup_file.endswith('.gz') else open
+        with opener(backup_file, 'rt', encoding='utf-8') as f:
             backup_data = json.load(f)
         
         # Restore JSON files
@@ -55,14 +101,11 @@ class BackupManager:
         print(f"Restored from: {backup_file}")
     
     def schedule_backups(self):
-        """Schedule automatic backups"""
-        schedule.every().day.at("02:00").do(self.create_backup)
-        schedule.every().sunday.at("03:00").do(self.create_full_backup)
-        
-        def run_scheduler():
-            while True:
-                schedule.run_pending()
-                time.sleep(60)
-        
-        thread = threading.Thread(target=run_scheduler, daemon=True)
-        thread.start()
\ No newline at end of file
+        """Schedule automatic backups (the scheduler sleeps until the next run time)"""
+        # A run missed while the process was down or busy fires once, within the hour
+        self.scheduler = BackgroundScheduler(job_defaults={"coalesce": True, "misfire_grace_time": 3600})
+        self.scheduler.add_job(self.create_backup, CronTrigger(hour=2, minute=0), id="daily_backup")
+        self.scheduler.add_job(self.create_full_backup, CronTrigger(day_of_week="sun", hour=3, minute=0),
+                               id="weekly_full_backup")
+        self.scheduler.start()
+        return self.scheduler
\ No newline at end of file
@@ -1,6 +1,15 @@
 # Add this class to your existing data_collector.py file
 # Place it near the top, after the imports
 
+from functools import lru_cache
+from types import MappingProxyType
+
+def json_default(obj):
+    """json.dump fallback for values the stdlib can't encode (recorded_at datetimes)"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 class ZambianMarketData:
     """Collect real market data from Zambian sources"""
     
@@ -11,28 +20,32 @@ class ZambianMarketData:
             "url": "https://www.znfu.co.zm/market-prices/",
             "type": "web",
             "active": True,
-            "priority": 1
+            "priority": 1,
+            "cache_ttl": 6 * 3600  # seconds - 6 hours (daily bulletins)
         },
         "MACO": {
             "name": "Ministry of Agriculture",
             "url": "https://www.mac.gov.zm/category/market-information/",
             "type": "web", 
             "active": True,
-            "priority": 1
+            "priority": 1,
+            "cache_ttl": 6 * 3600  # seconds - 6 hours
         },
         "CSO": {
             "name": "Central Statistical Office",
             "url": "https://www.zamstats.gov.zm/category/agriculture-statistics/",
             "type": "web",
             "active": True,
-            "priority": 2
+            "priority": 2,
+            "cache_ttl": 30 * 86400  # seconds - 30 days (monthly statistics)
         },
         "IAPRI": {
             "name": "Indaba Agricultural Policy Research Institute",
             "url": "https://iapri.org.zm/market-information/",
             "type": "api",
             "active": True,
-            "priority": 1
+            "priority": 1,
+            "cache_ttl": 7 * 86400  # seconds - 7 days (research cadence)
         },
         "FAO_Zambia": {
             "name": "FAO Zambia Statistics",
@@ -52,42 +65,42 @@ class ZambianMarketData:
     
     # Zambian markets by region
     ZAMBIAN_MARKETS = {
-        "Lusaka": [
+        "Lusaka": (
             "Lusaka Central Market", "City Market", "Soweto Market", 
             "Chilenje Market", "Matero Market", "Kamwala Market"
-        ],
-        "Copperbelt": [
+        ),
+        "Copperbelt": (
             "Ndola Main Market", "Kitwe Main Market", "Chingola Market",
             "Mufulira Market", "Luanshya Market", "Kalulushi Market"
-        ],
-        "Southern": [
+        ),
+        "Southern": (
             "Livingstone Main Market", "Choma Market", "Mazabuka Market",
             "Monze Market", "Kalomo Market", "Gwembe Market"
-        ],
-        "Central": [
+        ),
+        "Central": (
             "Kabwe Main Market", "Kapiri Mposhi Market", "Mkushi Market",
             "Serenje Market", "Mumbwa Market"
-        ],
-        "Eastern": [
+        ),
+        "Eastern": (
             "Chipata Main Market", "Petauke Market", "Katete Market",
             "Lundazi Market", "Mambwe Market"
-        ],
-        "Northern": [
+        ),
+        "Northern": (
             "Kasama Main Market", "Mbala Market", "Mpika Market",
             "Mporokoso Market", "Luwingu Market"
-        ],
-        "Luapula": [
+        ),
+        "Luapula": (
             "Mansa Main Market", "Samfya Market", "Kawambwa Market",
             "Nchelenge Market", "Mwense Market"
-        ],
-        "North-Western": [
+        ),
+        "North-Western": (
             "Solwezi Main Market", "Mwinilunga Market", "Zambezi Market",
             "Kabompo Market", "Manyinga Market"
-        ],
-        "Western": [
+        ),
+        "Western": (
             "Mongu Main Market", "Senanga Market", "Kalabo Market",
             "Sesheke Market", "Shangombo Market"
-        ]
+        )
     }
     
     # Realistic price ranges for Zambian commodities (ZMW per kg, 2024 ranges)
@@ -124,6 +137,181 @@ class ZambianMarketData:
         "Salt (kg)": {"min": 8, "max": 20, "typical": 14.00}
     }
     
+    # The same table as parallel columns, built once: _TYPICAL[_COMMODITY_IDX[name]]
+    _COMMODITY_IDX = MappingProxyType({name: i for i, name in enumerate(COMMODITY_PRICE_RANGES)})
+    _TYPICAL = tuple(r["typical"] for r in COMMODITY_PRICE_RANGES.values())
+    _MIN = tuple(r["min"] for r in COMMODITY_PRICE_RANGES.values())
+    _MAX = tuple(r["max"] for r in COMMODITY_PRICE_RANGES.values())
+    
+    # Price factor tables, built once and read-only (seasonal tables are indexed by month - 1)
+    _NO_SEASON = (1.0,) * 12
+    _MACO_SEASONAL = MappingProxyType({
+        "Maize": (1.08, 1.08, 1.08, 1.08, 1.08, 0.92, 0.92, 0.92, 1.08, 1.08, 1.08, 1.08),  # Harvest Jun-Aug
+        "Tomatoes": (0.95, 0.95, 0.95, 0.95, 0.95, 0.95, 0.95, 0.95, 0.95, 1.15, 1.15, 1.15)  # Rainy Oct-Dec
+    })
+    _HISTORICAL_SEASONAL = MappingProxyType({
+        # Maize prices are lowest during harvest (May-July), highest in the lean season (Jan-Feb)
+        "Maize": (1.15, 1.15, 1.0, 1.0, 0.85, 0.85, 0.85, 1.0, 1.0, 1.0, 1.0, 1.0),
+        # Tomatoes are expensive in rainy season (Nov-Feb)
+        "Tomatoes": (1.20, 1.20, 0.90, 0.90, 0.90, 0.90, 0.90, 0.90, 0.90, 0.90, 1.20, 1.20)
+    })
+    _REGION_FACTORS = MappingProxyType({
+        "Copperbelt": 1.02,  # Industrial region, slightly higher
+        "Southern": 0.98,    # Agricultural heartland
+        "Eastern": 1.00,
+        "Central": 0.97
+    })
+    # Provincial price variations (based on CSO data patterns)
+    _PROVINCE_FACTORS = MappingProxyType({
+        "Lusaka": 1.05,
+        "Copperbelt": 1.03,
+        "Southern": 1.00,
+        "Eastern": 0.98,
+        "Central": 0.96,
+        "Northern": 0.97,
+        "Luapula": 0.95,
+        "North-Western": 0.94,
+        "Western": 0.93
+    })
+    # Price multipliers by market level
+    _MARKET_LEVEL_MULTIPLIERS = MappingProxyType({
+        "Farm Gate": 0.85,    # Farmers receive less
+        "Wholesale": 1.00,    # Base price
+        "Retail": 1.25        # Consumers pay more
+    })
+    _HISTORICAL_MARKET_FACTORS = MappingProxyType({
+        "Lusaka Central": 1.05,
+        "Ndola Main": 1.03,
+        "Livingstone Market": 0.98,
+        "Kabwe Main": 0.96
+    })
+    
+    # Realistic-range multipliers (min, max) by market type; anything else uses the retail range
+    _MARKET_TYPE_FACTORS = MappingProxyType({
+        "farm_gate": (1, 0.85),  # Farm gate prices are lower
+        "wholesale": (0.90, 1.10)
+    })
+    
+    # Historical price storage
+    HISTORICAL_PARQUET = "data/historical_prices.parquet"
+    HISTORICAL_CSV_GZ = "data/historical_prices.csv.gz"
+    HISTORICAL_CSV = "data/historical_prices.csv"
+    
+    # Disk cache for fetched source payloads (TTL per source, see SOURCES)
+    CACHE_DIR = "data/cache"
+    # Hit/miss counters live in SQLite so every gunicorn worker adds to the same totals
+    CACHE_STATS_DB = "data/cache/stats.db"
+    
+    @staticmethod
+    def _cache_path(source):
+        return os.path.join(ZambianMarketData.CACHE_DIR, f"{source}.json")
+    
+    @staticmethod
+    def _cache_get(source, ttl):
+        """Get a source's cached prices if younger than ttl seconds (None on miss)"""
+        import json
+        import time
+        
+        path = ZambianMarketData._cache_path(source)
+        try:
+            if time.time() - os.stat(path).st_mtime < ttl:
+                with open(path, encoding="utf-8") as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+        return None
+    
+    @staticmethod
+    def _cache_put(source, prices):
+        """Store a source's prices (written to a temp file, then swapped in)"""
+        import json
+        
+        import tempfile
+        
+        path = ZambianMarketData._cache_path(source)
+        tmp_path = None
+        try:
+            os.makedirs(ZambianMarketData.CACHE_DIR, exist_ok=True)
+            # A temp file of our own, so workers refreshing the same source never share one
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=ZambianMarketData.CACHE_DIR,
+                                             prefix=f"{source}.", suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+                json.dump(prices, f, default=json_default)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not cache {source} data: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    @staticmethod
+    def _count_cache_lookup(source, column):
+        """Add one to a source's 'hits' or 'misses' counter"""
+        import sqlite3
+        
+        try:
+            os.makedirs(ZambianMarketData.CACHE_DIR, exist_ok=True)
+            conn = sqlite3.connect(ZambianMarketData.CACHE_STATS_DB, timeout=5)
+            try:
+                with conn:
+                    conn.execute("""
+                        CREATE TABLE IF NOT EXISTS cache_stats (
+                            source TEXT PRIMARY KEY,
+                            hits INTEGER NOT NULL DEFAULT 0,
+                            misses INTEGER NOT NULL DEFAULT 0
+                        )
+                    """)
+                    conn.execute(f"""
+                        INSERT INTO cache_stats (source, {column}) VALUES (?, 1)
+                        ON CONFLICT(source) DO UPDATE SET {column} = {column} + 1
+                    """, (source,))
+            finally:
+                conn.close()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Could not count {source} cache lookup: {e}")
+    
+    @staticmethod
+    def cache_stats():
+        """Hit/miss totals across all workers, plus per-source counts"""
+        import sqlite3
+        
+        stats = {"hits": 0, "misses": 0, "sources": {}}
+        if not os.path.exists(ZambianMarketData.CACHE_STATS_DB):
+            return stats
+        
+        conn = sqlite3.connect(ZambianMarketData.CACHE_STATS_DB, timeout=5)
+        try:
+            rows = conn.execute("SELECT source, hits, misses FROM cache_stats").fetchall()
+        except sqlite3.OperationalError:
+            rows = []  # no lookups counted yet
+        finally:
+            conn.close()
+        
+        for source, hits, misses in rows:
+            stats["hits"] += hits
+            stats["misses"] += misses
+            stats["sources"][source] = {"hits": hits, "misses": misses}
+        return stats
+    
+    @staticmethod
+    def fetch_cached(source, fetch_function):
+        """Serve a source from the disk cache, fetching only when its TTL has expired"""
+        ttl = ZambianMarketData.SOURCES.get(source, {}).get("cache_ttl", 0)
+        prices = ZambianMarketData._cache_get(source, ttl) if ttl else None
+        if prices is not None:
+            ZambianMarketData._count_cache_lookup(source, "hits")
+            return prices
+        
+        ZambianMarketData._count_cache_lookup(source, "misses")
+        prices = fetch_function()
+        if prices and ttl:
+            ZambianMarketData._cache_put(source, prices)
+        return prices
+    
+    @staticmethod
+    def cache_max_age():
+        """Shortest source TTL, i.e. how long a combined response stays fresh"""
+        return min(src["cache_ttl"] for src in ZambianMarketData.SOURCES.values() if "cache_ttl" in src)
+    
     @staticmethod
     def fetch_znfu_prices():
         """Fetch prices from Zambia National Farmers Union"""
@@ -136,50 +324,62 @@ class ZambianMarketData:
             # 3. Use their API if available
             
             # For now, simulate realistic Zambian data
+            import numpy as np
+            
             markets = ZambianMarketData.ZAMBIAN_MARKETS["Lusaka"][:3]
             commodities = ["Maize", "Tomatoes", "Beans", "Rice", "Groundnuts"]
             
+            # Volume range in kg
+            volume_ranges = {
+                "Maize": (5000, 20000),
+                "Tomatoes": (2000, 8000),
+                "Beans": (1000, 5000),
+                "Rice": (3000, 10000),
+                "Groundnuts": (2000, 7000)
+            }
+            
+            rows = [(market, commodity) for market in markets for commodity in commodities
+                    if commodity in ZambianMarketData._COMMODITY_IDX]
+            
+            # Read the clock once for the whole batch
+            now = datetime.now()
+            
+            # Daily variation (-3% to +5%)
+            daily_variation = 1 + (now.day % 21 - 10) * 0.008
+            
+            # Draw every row's volume and quality in one batch
+            rng = np.random.default_rng()
+            low, high = np.array([volume_ranges.get(commodity, (1000, 1000)) for _, commodity in rows],
+                                 dtype=int).reshape(-1, 2).T
+            volumes = rng.integers(low, high, endpoint=True)
+            qualities = rng.choice(["Grade A", "Grade B", "Standard"], len(rows))
+            
             prices = []
-            for market in markets:
-                for commodity in commodities:
-                    price_range = ZambianMarketData.COMMODITY_PRICE_RANGES.get(commodity)
-                    if price_range:
-                        # Realistic variation based on market and day
-                        base_price = price_range["typical"]
-                        market_factor = 1.0
-                        
-                        # Market-specific adjustments
-                        if "Central" in market:
-                            market_factor = 1.05  # Lusaka Central is usually higher
-                        elif "Soweto" in market:
-                            market_factor = 0.95  # Soweto might be slightly lower
-                        
-                        # Daily variation (-3% to +5%)
-                        daily_variation = 1 + (datetime.now().day % 21 - 10) * 0.008
-                        
-                        price = base_price * market_factor * daily_variation
-                        price = round(price, 2)
-                        
-                        # Volume in kg
-                        volumes = {
-                            "Maize": random.randint(5000, 20000),
-                            "Tomatoes": random.randint(2000, 8000),
-                            "Beans": random.randint(1000, 5000),
-                            "Rice": random.randint(3000, 10000),
-                            "Groundnuts": random.randint(2000, 7000)
-                        }
-                        
-                        prices.append({
-                            "market": market,
-                            "commodity": commodity,
-                            "price": price,
-                            "unit": "ZMW/kg",
-                            "volume": volumes.get(commodity, 1000),
-                            "quality": random.choice(["Grade A", "Grade B", "Standard"]),
-                            "source": "ZNFU",
-                            "verified": True,
-                            "recorded_at": datetime.now().isoformat()
-                        })
+            for i, (market, commodity) in enumerate(rows):
+                # Realistic variation based on market and day
+                base_price = ZambianMarketData._TYPICAL[ZambianMarketData._COMMODITY_IDX[commodity]]
+                market_factor = 1.0
+                
+                # Market-specific adjustments
+                if "Central" in market:
+                    market_factor = 1.05  # Lusaka Central is usually higher
+                elif "Soweto" in market:
+                    market_factor = 0.95  # Soweto might be slightly lower
+                
+                price = base_price * market_factor * daily_variation
+                price = round(price, 2)
+                
+                prices.append({
+                    "market": market,
+                    "commodity": commodity,
+                    "price": price,
+                    "unit": "ZMW/kg",
+                    "volume": int(volumes[i]),
+                    "quality": str(qualities[i]),
+                    "source": "ZNFU",
+                    "verified": True,
+                    "recorded_at": now
+                })
             
             print(f"✅ Fetched {len(prices)} prices from ZNFU simulation")
             return prices
@@ -197,54 +397,39 @@ class ZambianMarketData:
             # This would scrape: https://www.mac.gov.zm/category/market-information/
             
             # Simulate regional market data
+            import numpy as np
+            
             regions = ["Copperbelt", "Southern", "Eastern", "Central"]
             commodities = ["Maize", "Beans", "Groundnuts", "Rice", "Tomatoes"]
             
+            # Draw the random variation and volume for every row in one batch
+            rng = np.random.default_rng()
+            n = sum(len(ZambianMarketData.ZAMBIAN_MARKETS.get(region, ())[:2]) for region in regions[:2]) * len(commodities)
+            variations = iter(rng.uniform(0.97, 1.03, n).tolist())
+            volumes = iter(rng.integers(1000, 5000, n, endpoint=True).tolist())
+            
+            # Read the clock once for the whole batch (seasonal adjustment uses the month)
+            now = datetime.now()
+            month = now.month
+            
             prices = []
             for region in regions[:2]:  # Limit to 2 regions for demo
-                markets = ZambianMarketData.ZAMBIAN_MARKETS.get(region, [])[:2]
+                markets = ZambianMarketData.ZAMBIAN_MARKETS.get(region, ())[:2]
                 for market in markets:
                     for commodity in commodities:
-                        price_range = ZambianMarketData.COMMODITY_PRICE_RANGES.get(commodity)
-                        if price_range:
-                            # Regional price variations
-                            region_factors = {
-                                "Copperbelt": 1.02,  # Industrial region, slightly higher
-                                "Southern": 0.98,    # Agricultural heartland
-                                "Eastern": 1.00,
-                                "Central": 0.97
-                            }
-                            
-                            base_price = price_range["typical"]
-                            region_factor = region_factors.get(region, 1.0)
-                            
-                            # Seasonal adjustment
-                            month = datetime.now().month
-                            if commodity == "Maize":
-                                if month in [6, 7, 8]:  # Harvest season
-                                    seasonal_factor = 0.92
-                                else:  # Lean season
-                                    seasonal_factor = 1.08
-                            elif commodity == "Tomatoes":
-                                if month in [10, 11, 12]:  # Rainy season
-                                    seasonal_factor = 1.15
-                                else:
-                                    seasonal_factor = 0.95
-                            else:
-                                seasonal_factor = 1.0
-                            
-                            price = base_price * region_factor * seasonal_factor
-                            price = round(price * random.uniform(0.97, 1.03), 2)  # Small random variation
+                        price = ZambianMarketData._maco_base_price(commodity, region, month)
+                        if price is not None:
+                            price = round(price * next(variations), 2)  # Small random variation
                             
                             prices.append({
                                 "market": market,
                                 "commodity": commodity,
                                 "price": price,
                                 "unit": "ZMW/kg",
-                                "volume": random.randint(1000, 5000),
+                                "volume": next(volumes),
                                 "source": f"MACO_{region}",
                                 "verified": True,
-                                "recorded_at": datetime.now().isoformat()
+                                "recorded_at": now
                             })
             
             print(f"✅ Fetched {len(prices)} prices from MACO simulation")
@@ -254,6 +439,17 @@ class ZambianMarketData:
             print(f"❌ MACO fetch error: {e}")
             return []
     
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _maco_base_price(commodity, region, month):
+        """Typical price x region factor x seasonal factor (None for unknown commodities)"""
+        idx = ZambianMarketData._COMMODITY_IDX.get(commodity)
+        if idx is None:
+            return None
+        region_factor = ZambianMarketData._REGION_FACTORS.get(region, 1.0)
+        seasonal_factor = ZambianMarketData._MACO_SEASONAL.get(commodity, ZambianMarketData._NO_SEASON)[month - 1]
+        return ZambianMarketData._TYPICAL[idx] * region_factor * seasonal_factor
+    
     @staticmethod
     def fetch_cso_statistics():
         """Fetch agricultural statistics from CSO Zambia"""
@@ -266,27 +462,17 @@ class ZambianMarketData:
             provinces = ["Lusaka", "Copperbelt", "Southern", "Eastern", "Central"]
             commodities = ["Maize", "Rice", "Beans", "Groundnuts"]
             
+            # CSO data tends to be monthly averages, stamped with the first of the month
+            month_start = datetime.now().replace(day=1)
+            
             prices = []
             for province in provinces:
                 # CSO provides provincial averages
                 for commodity in commodities:
-                    price_range = ZambianMarketData.COMMODITY_PRICE_RANGES.get(commodity)
-                    if price_range:
-                        # Provincial price variations (based on CSO data patterns)
-                        province_factors = {
-                            "Lusaka": 1.05,
-                            "Copperbelt": 1.03,
-                            "Southern": 1.00,
-                            "Eastern": 0.98,
-                            "Central": 0.96,
-                            "Northern": 0.97,
-                            "Luapula": 0.95,
-                            "North-Western": 0.94,
-                            "Western": 0.93
-                        }
-                        
-                        base_price = price_range["typical"]
-                        province_factor = province_factors.get(province, 1.0)
+                    idx = ZambianMarketData._COMMODITY_IDX.get(commodity)
+                    if idx is not None:
+                        base_price = ZambianMarketData._TYPICAL[idx]
+                        province_factor = ZambianMarketData._PROVINCE_FACTORS.get(province, 1.0)
                         
                         # CSO data tends to be monthly averages
                         price = base_price * province_factor
@@ -300,7 +486,7 @@ class ZambianMarketData:
                             "volume": None,  # CSO doesn't always provide volume
                             "source": "CSO_Zambia",
                             "verified": True,
-                            "recorded_at": datetime.now().replace(day=1).isoformat()  # Monthly data
+                            "recorded_at": month_start  # Monthly data
                         })
             
             print(f"✅ Fetched {len(prices)} statistical prices from CSO")
@@ -318,12 +504,21 @@ class ZambianMarketData:
             
             # IAPRI provides research-based market data at: https://iapri.org.zm/
             
+            import numpy as np
+            
             commodities = ["Maize", "Soybeans", "Groundnuts", "Sunflower", "Cotton"]
             
+            # Draw the random variation and volume for every row in one batch (3 market levels each)
+            rng = np.random.default_rng()
+            n = len(commodities) * 3
+            variations = iter(rng.uniform(0.98, 1.02, n).tolist())
+            volumes = iter(rng.integers(2000, 10000, n, endpoint=True).tolist())
+            now = datetime.now()
+            
             prices = []
             for commodity in commodities:
-                price_range = ZambianMarketData.COMMODITY_PRICE_RANGES.get(commodity)
-                if price_range:
+                idx = ZambianMarketData._COMMODITY_IDX.get(commodity)
+                if idx is not None:
                     # IAPRI provides detailed analysis including:
                     # - Farm gate prices
                     # - Wholesale prices  
@@ -332,27 +527,20 @@ class ZambianMarketData:
                     markets = ["Farm Gate", "Wholesale", "Retail"]
                     
                     for market_type in markets:
-                        base_price = price_range["typical"]
-                        
-                        # Price multipliers by market level
-                        market_multipliers = {
-                            "Farm Gate": 0.85,    # Farmers receive less
-                            "Wholesale": 1.00,    # Base price
-                            "Retail": 1.25        # Consumers pay more
-                        }
+                        base_price = ZambianMarketData._TYPICAL[idx]
                         
-                        price = base_price * market_multipliers.get(market_type, 1.0)
-                        price = round(price * random.uniform(0.98, 1.02), 2)
+                        price = base_price * ZambianMarketData._MARKET_LEVEL_MULTIPLIERS.get(market_type, 1.0)
+                        price = round(price * next(variations), 2)
                         
                         prices.append({
                             "market": f"IAPRI {market_type}",
                             "commodity": commodity,
                             "price": price,
                             "unit": "ZMW/kg",
-                            "volume": random.randint(2000, 10000),
+                            "volume": next(volumes),
                             "source": "IAPRI_Research",
                             "verified": True,
-                            "recorded_at": datetime.now().isoformat()
+                            "recorded_at": now
                         })
             
             print(f"✅ Fetched {len(prices)} research prices from IAPRI")
@@ -365,28 +553,39 @@ class ZambianMarketData:
     @staticmethod
     def fetch_all_sources():
         """Fetch data from all Zambian sources"""
+        import asyncio
+        from itertools import chain
+        
         print("=" * 60)
         print("🌍 FETCHING ZAMBIAN AGRICULTURAL MARKET DATA")
         print("=" * 60)
         
-        all_prices = []
-        
         # Fetch from each source
         sources = [
-            ("ZNFU", ZambianMarketData.fetch_znfu_prices),
-            ("Ministry of Agriculture", ZambianMarketData.fetch_maco_prices),
-            ("CSO Statistics", ZambianMarketData.fetch_cso_statistics),
-            ("IAPRI Research", ZambianMarketData.fetch_iapri_data)
+            ("ZNFU", "ZNFU", ZambianMarketData.fetch_znfu_prices),
+            ("Ministry of Agriculture", "MACO", ZambianMarketData.fetch_maco_prices),
+            ("CSO Statistics", "CSO", ZambianMarketData.fetch_cso_statistics),
+            ("IAPRI Research", "IAPRI", ZambianMarketData.fetch_iapri_data)
         ]
         
-        for source_name, fetch_function in sources:
-            try:
-                prices = fetch_function()
-                if prices:
-                    all_prices.extend(prices)
-                    print(f"📥 {source_name}: {len(prices)} records")
-            except Exception as e:
-                print(f"⚠️  {source_name} failed: {e}")
+        async def gather_sources():
+            # Fetchers block on network I/O, so run them side by side (total time = slowest source)
+            return await asyncio.gather(
+                *(asyncio.to_thread(ZambianMarketData.fetch_cached, source, fetch_function)
+                  for _, source, fetch_function in sources),
+                return_exceptions=True
+            )
+        
+        batches = []
+        for (source_name, _, _), prices in zip(sources, asyncio.run(gather_sources())):
+            if isinstance(prices, Exception):
+                print(f"⚠️  {source_name} failed: {prices}")
+            elif prices:
+                batches.append(prices)
+                print(f"📥 {source_name}: {len(prices)} records")
+        
+        # Concatenate once, at the boundary (no list grown by repeated extends)
+        all_prices = list(chain.from_iterable(batches))
         
         print(f"\n✅ Total collected: {len(all_prices)} price records")
         print("=" * 60)
@@ -397,24 +596,35 @@ class ZambianMarketData:
     def load_historical_prices():
         """Load historical Zambian market data"""
         try:
-            # Check for historical data file
-            hist_path = "data/historical_prices.csv"
-            if os.path.exists(hist_path):
+            # Check for historical data file (Parquet first, gzipped/plain CSV files still load)
+            hist_path = next((path for path in (ZambianMarketData.HISTORICAL_PARQUET,
+                                                ZambianMarketData.HISTORICAL_CSV_GZ,
+                                                ZambianMarketData.HISTORICAL_CSV)
+                              if os.path.exists(path)), None)
+            if hist_path:
                 print(f"📚 Loading historical data from {hist_path}")
-                df = pd.read_csv(hist_path)
+                if hist_path.endswith(".parquet"):
+                    df = pd.read_parquet(hist_path)
+                else:
+                    # compression is inferred from the .gz suffix
+                    df = pd.read_csv(hist_path)
                 
-                # Convert to list of dictionaries
-                historical_data = []
-                for _, row in df.iterrows():
-                    historical_data.append({
-                        "market": row.get("Market", "Unknown"),
-                        "commodity": row.get("Commodity", "Unknown"),
-                        "price": float(row.get("Price", 0)),
-                        "unit": row.get("Unit", "ZMW/kg"),
-                        "recorded_at": row.get("Date", datetime.now().isoformat()),
-                        "source": "Historical_Data",
-                        "verified": True
-                    })
+                # Convert to list of dictionaries (column-wise, no per-row Series)
+                df = df.rename(columns=str.lower)
+                columns = {"market": "market", "commodity": "commodity", "price": "price",
+                           "unit": "unit", "date": "recorded_at", "recorded_at": "recorded_at"}
+                defaults = {"market": "Unknown", "commodity": "Unknown", "price": 0,
+                            "unit": "ZMW/kg", "recorded_at": datetime.now().isoformat()}
+                df = df[[col for col in columns if col in df.columns]].rename(columns=columns)
+                df = df.loc[:, ~df.columns.duplicated()]
+                for col, default in defaults.items():
+                    if col not in df.columns:
+                        df[col] = default
+                df = df[list(defaults)].fillna(defaults)
+                df["price"] = df["price"].astype(float)
+                df["source"] = "Historical_Data"
+                df["verified"] = True
+                historical_data = df.to_dict(orient="records")
                 
                 print(f"✅ Loaded {len(historical_data)} historical records")
                 return historical_data
@@ -431,69 +641,58 @@ class ZambianMarketData:
         """Generate realistic sample historical data for Zambia"""
         print("📊 Generating realistic Zambian historical data...")
         
-        historical_data = []
-        commodities = ["Maize", "Tomatoes", "Beans", "Rice", "Groundnuts"]
+        import numpy as np
+        
+        commodities = [c for c in ["Maize", "Tomatoes", "Beans", "Rice", "Groundnuts"]
+                       if c in ZambianMarketData._COMMODITY_IDX]
         markets = ["Lusaka Central", "Ndola Main", "Livingstone Market", "Kabwe Main"]
         
         # Generate 90 days of historical data
-        for days_ago in range(90, 0, -1):
-            date = datetime.now() - timedelta(days=days_ago)
-            
-            for market in markets:
-                for commodity in commodities:
-                    price_range = ZambianMarketData.COMMODITY_PRICE_RANGES.get(commodity)
-                    if price_range:
-                        # Base price with seasonal trends
-                        base_price = price_range["typical"]
-                        
-                        # Seasonal effects
-                        month = date.month
-                        if commodity == "Maize":
-                            # Maize prices are lowest during harvest (May-July)
-                            if month in [5, 6, 7]:
-                                seasonal_factor = 0.85
-                            elif month in [1, 2]:  # Lean season
-                                seasonal_factor = 1.15
-                            else:
-                                seasonal_factor = 1.0
-                        elif commodity == "Tomatoes":
-                            # Tomatoes are expensive in rainy season (Nov-Feb)
-                            if month in [11, 12, 1, 2]:
-                                seasonal_factor = 1.20
-                            else:
-                                seasonal_factor = 0.90
-                        else:
-                            seasonal_factor = 1.0
-                        
-                        # Market variation
-                        market_factors = {
-                            "Lusaka Central": 1.05,
-                            "Ndola Main": 1.03,
-                            "Livingstone Market": 0.98,
-                            "Kabwe Main": 0.96
-                        }
-                        
-                        # Random daily variation
-                        daily_variation = random.uniform(0.97, 1.03)
-                        
-                        price = base_price * seasonal_factor * market_factors.get(market, 1.0) * daily_variation
-                        price = round(price, 2)
-                        
-                        historical_data.append({
-                            "market": market,
-                            "commodity": commodity,
-                            "price": price,
-                            "unit": "ZMW/kg",
-                            "volume": random.randint(1000, 5000),
-                            "source": "Generated_Historical",
-                            "verified": True,
-                            "recorded_at": date.isoformat()
-                        })
+        now = datetime.now()
+        dates = [now - timedelta(days=days_ago) for days_ago in range(90, 0, -1)]
+        
+        # One row per (day, market, commodity), oldest day first
+        grid = pd.MultiIndex.from_product(
+            [range(len(dates)), markets, commodities], names=["day", "market", "commodity"]
+        ).to_frame(index=False)
+        day = grid["day"].to_numpy()
+        months = np.array([date.month for date in dates])[day]
+        
+        # Seasonal effects: one (commodity x month) table lookup per row
+        seasonal_table = np.array([
+            ZambianMarketData._HISTORICAL_SEASONAL.get(c, ZambianMarketData._NO_SEASON) for c in commodities
+        ])
+        commodity_pos = grid["commodity"].map({c: i for i, c in enumerate(commodities)}).to_numpy()
+        seasonal_factor = seasonal_table[commodity_pos, months - 1]
         
-        # Save to CSV for future use
+        commodity_idx = grid["commodity"].map(dict(ZambianMarketData._COMMODITY_IDX)).to_numpy()
+        base_price = np.array(ZambianMarketData._TYPICAL)[commodity_idx]
+        market_factor = grid["market"].map(dict(ZambianMarketData._HISTORICAL_MARKET_FACTORS)).fillna(1.0).to_numpy()
+        
+        # Random daily variation and volumes, drawn for all rows at once
+        rng = np.random.default_rng()
+        daily_variation = rng.uniform(0.97, 1.03, len(grid))
+        
+        df = pd.DataFrame({
+            "market": grid["market"],
+            "commodity": grid["commodity"],
+            "price": np.round(base_price * seasonal_factor * market_factor * daily_variation, 2),
+            "unit": "ZMW/kg",
+            "volume": rng.integers(1000, 5000, len(grid), endpoint=True),
+            "source": "Generated_Historical",
+            "verified": True,
+            "recorded_at": np.array([date.isoformat() for date in dates])[day]
+        })
+        
+        # Save for future use (compressed Parquet, gzipped CSV when pyarrow is not installed)
         os.makedirs("data", exist_ok=True)
-        df = pd.DataFrame(historical_data)
-        df.to_csv("data/historical_prices.csv", index=False)
+        try:
+            df.to_parquet(ZambianMarketData.HISTORICAL_PARQUET, engine="pyarrow",
+                          compression="zstd", index=False)
+        except ImportError:
+            df.to_csv(ZambianMarketData.HISTORICAL_CSV_GZ, index=False,
+                      compression="gzip", chunksize=10000)
+        historical_data = df.to_dict(orient="records")
         
         print(f"✅ Generated and saved {len(historical_data)} historical records")
         return historical_data
@@ -506,7 +705,7 @@ class ZambianMarketData:
     @staticmethod
     def get_markets_by_region(region):
         """Get markets for a specific region"""
-        return ZambianMarketData.ZAMBIAN_MARKETS.get(region, [])
+        return ZambianMarketData.ZAMBIAN_MARKETS.get(region, ())
     
     @staticmethod
     def get_commodity_info(commodity):
@@ -516,48 +715,91 @@ class ZambianMarketData:
     @staticmethod
     def validate_price(commodity, price, market_type="retail"):
         """Validate if a price is realistic for Zambia"""
-        price_range = ZambianMarketData.COMMODITY_PRICE_RANGES.get(commodity)
-        if not price_range:
+        idx = ZambianMarketData._COMMODITY_IDX.get(commodity)
+        if idx is None:
             return False, "Commodity not found"
         
-        min_price = price_range["min"]
-        max_price = price_range["max"]
-        
         # Adjust ranges based on market type
-        if market_type == "farm_gate":
-            max_price = max_price * 0.85  # Farm gate prices are lower
-        elif market_type == "wholesale":
-            min_price = min_price * 0.90
-            max_price = max_price * 1.10
+        min_factor, max_factor = ZambianMarketData._MARKET_TYPE_FACTORS.get(market_type, (1, 1))
+        min_price = ZambianMarketData._MIN[idx] * min_factor
+        max_price = ZambianMarketData._MAX[idx] * max_factor
         
         if min_price <= price <= max_price:
             return True, f"Price is within realistic range (ZMW {min_price} - {max_price})"
         else:
             return False, f"Price outside realistic range (ZMW {min_price} - {max_price})"
+    
+    @staticmethod
+    def validate_prices(commodities, prices, market_types="retail"):
+        """Validate a batch of prices at once (boolean array, False for unknown commodities)"""
+        import numpy as np
+        
+        codes = np.array([ZambianMarketData._COMMODITY_IDX.get(c, -1) for c in commodities], dtype=int)
+        if isinstance(market_types, str):
+            market_types = [market_types] * len(codes)
+        factors = np.array([ZambianMarketData._MARKET_TYPE_FACTORS.get(t, (1, 1)) for t in market_types],
+                           dtype=float).reshape(-1, 2)
+        
+        known = codes >= 0
+        codes = np.where(known, codes, 0)
+        min_prices = np.array(ZambianMarketData._MIN, dtype=float)[codes] * factors[:, 0]
+        max_prices = np.array(ZambianMarketData._MAX, dtype=float)[codes] * factors[:, 1]
+        prices = np.asarray(prices, dtype=float)
+        
+        return known & (min_prices <= prices) & (prices <= max_prices)
 
 # Integration with existing DatabaseManager class
-# Add this method to your DatabaseManager class:
+# Add this method to your DatabaseManager class (self.db_path is its SQLite file):
+
+def _recorded_at_text(recorded_at):
+    """ISO text for a recorded_at value that may be a datetime or already a string"""
+    return recorded_at.isoformat() if isinstance(recorded_at, datetime) else recorded_at
 
 def save_zambian_prices(self, prices):
-    """Save Zambian market prices to database"""
-    saved_count = 0
-    
-    for price_data in prices:
-        # Create MarketPrice object
-        market_price = MarketPrice(
-            market=price_data.get("market", "Unknown"),
-            commodity=price_data.get("commodity", "Unknown"),
-            price=float(price_data.get("price", 0)),
-            unit=price_data.get("unit", "ZMW/kg"),
-            volume=price_data.get("volume"),
-            quality=price_data.get("quality"),
-            source=price_data.get("source", "Zambian_Source"),
-            verified=price_data.get("verified", False),
-            timestamp=datetime.fromisoformat(price_data.get("recorded_at", datetime.now().isoformat()))
-        )
-        
-        if self.save_price(market_price):
-            saved_count += 1
+    """Save Zambian market prices to database (one transaction, one executemany)"""
+    import sqlite3
+    
+    # Prices outside their commodity's realistic range are stored unverified for review
+    # (commodities without a known range keep the source's flag)
+    commodities = [price_data.get("commodity", "Unknown") for price_data in prices]
+    price_values = [float(price_data.get("price", 0)) for price_data in prices]
+    # IAPRI reports farm gate and wholesale levels, which have their own ranges
+    market_types = ["farm_gate" if market.endswith("Farm Gate") else
+                    "wholesale" if market.endswith("Wholesale") else "retail"
+                    for market in (price_data.get("market", "") for price_data in prices)]
+    realistic = ZambianMarketData.validate_prices(commodities, price_values, market_types).tolist()
+    known = ZambianMarketData._COMMODITY_IDX
+    flagged = sum(1 for c, ok in zip(commodities, realistic) if c in known and not ok)
+    if flagged:
+        print(f"⚠️  {flagged} price(s) outside realistic ranges saved as unverified")
+    
+    # Fetchers hand over datetime objects (cached batches come back as ISO strings);
+    # format each one once here instead of parsing and re-serializing it
+    now = datetime.now()
+    rows = [(
+        price_data.get("market", "Unknown"),
+        commodity,
+        price,
+        price_data.get("unit", "ZMW/kg"),
+        price_data.get("volume"),
+        price_data.get("quality"),
+        price_data.get("source", "Zambian_Source"),
+        1 if price_data.get("verified", False) and (ok or commodity not in known) else 0,
+        _recorded_at_text(price_data.get("recorded_at") or now)
+    ) for price_data, commodity, price, ok in zip(prices, commodities, price_values, realistic)]
+    
+    conn = sqlite3.connect(self.db_path)
+    try:
+        with conn:
+            # Duplicates (same market, commodity and time) are skipped, not counted
+            cur = conn.executemany("""
+                INSERT OR IGNORE INTO market_prices
+                    (market, commodity, price, unit, volume, quality, source, verified, recorded_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        saved_count = cur.rowcount
+    finally:
+        conn.close()
     
     return saved_count
 
@@ -565,17 +807,37 @@ def save_zambian_prices(self, prices):
 @app.route("/api/prices/zambian", methods=["GET"])
 def get_zambian_prices():
     """Get real Zambian market prices"""
+    import json
+    from flask import Response
+    
+    # orjson serializes in C (and handles numpy values and datetimes); stdlib json is the fallback
+    try:
+        import orjson
+        
+        def dumps(obj):
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    except ImportError:
+        def dumps(obj):
+            return json.dumps(obj, default=json_default).encode("utf-8")
+    
     try:
         # Fetch from Zambian sources
         zambian_data = ZambianMarketData()
         prices = zambian_data.fetch_all_sources()
+        message = f"Fetched {len(prices)} prices from Zambian sources"
         
-        return jsonify({
-            "success": True,
-            "message": f"Fetched {len(prices)} prices from Zambian sources",
-            "prices": prices,
-            "timestamp": datetime.now().isoformat()
-        })
+        def generate():
+            # Stream the JSON body in chunks instead of building one large string;
+            # each chunk is one serializer call over 500 records, minus the list brackets
+            yield b'{"success":true,"message":' + dumps(message) + b',"prices":['
+            for start in range(0, len(prices), 500):
+                chunk = dumps(prices[start:start + 500])[1:-1]
+                yield b"," + chunk if start else chunk
+            yield b'],"timestamp":' + dumps(datetime.now()) + b"}"
+        
+        response = Response(generate(), mimetype="application/json")
+        response.cache_control.max_age = ZambianMarketData.cache_max_age()
+        return response
         
     except Exception as e:
         return jsonify({
@@ -583,11 +845,21 @@ def get_zambian_prices():
             "error": str(e)
         }), 500
 
+@app.route("/api/prices/zambian/cache/stats", methods=["GET"])
+def get_zambian_cache_stats():
+    """Source cache hit/miss counters"""
+    return jsonify({
+        "success": True,
+        "stats": ZambianMarketData.cache_stats(),
+        "cache_dir": ZambianMarketData.CACHE_DIR
+    })
+
 # Add this scheduled task to collect Zambian data daily:
 def schedule_zambian_data_collection():
     """Schedule daily collection of Zambian market data"""
-    import schedule
-    import time
+    import atexit
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.triggers.cron import CronTrigger
     
     def collect_zambian_data():
         print("🕒 Scheduled: Collecting Zambian market data...")
@@ -604,15 +876,16 @@ def schedule_zambian_data_collection():
         except Exception as e:
             print(f"❌ Zambian data collection failed: {e}")
     
-    # Schedule daily at 9:00 AM
-    schedule.every().day.at("09:00").do(collect_zambian_data)
+    # Schedule daily at 9:00 AM (the scheduler thread sleeps until then; a late run still
+    # fires within the hour)
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(collect_zambian_data, CronTrigger(hour=9, minute=0), id="zambian_daily",
+                      misfire_grace_time=3600, coalesce=True)
+    scheduler.start()
+    atexit.register(scheduler.shutdown)
     
     print("⏰ Scheduled Zambian data collection: Daily at 9:00 AM")
-    
-    # Run the scheduler
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    return scheduler
 
 # Quick test function
 def test_zambian_data():
@@ -620,24 +893,23 @@ def test_zambian_data():
     print("🧪 Testing Zambian Market Data Collection")
     print("=" * 50)
     
-    zambian = ZambianMarketData()
+    from concurrent.futures import ThreadPoolExecutor
     
-    # Test data fetching
-    print("\n1. Testing ZNFU data...")
-    znfu_prices = zambian.fetch_znfu_prices()
-    print(f"   ZNFU: {len(znfu_prices)} prices")
-    
-    print("\n2. Testing Ministry of Agriculture data...")
-    maco_prices = zambian.fetch_maco_prices()
-    print(f"   MACO: {len(maco_prices)} prices")
+    zambian = ZambianMarketData()
     
-    print("\n3. Testing CSO statistics...")
-    cso_prices = zambian.fetch_cso_statistics()
-    print(f"   CSO: {len(cso_prices)} prices")
+    # Test data fetching (sources are independent, so fetch them all at once)
+    fetchers = [
+        ("1. Testing ZNFU data...", "ZNFU", zambian.fetch_znfu_prices),
+        ("2. Testing Ministry of Agriculture data...", "MACO", zambian.fetch_maco_prices),
+        ("3. Testing CSO statistics...", "CSO", zambian.fetch_cso_statistics),
+        ("4. Testing IAPRI data...", "IAPRI", zambian.fetch_iapri_data)
+    ]
+    with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+        futures = [executor.submit(fetch_function) for _, _, fetch_function in fetchers]
     
-    print("\n4. Testing IAPRI data...")
-    iapri_prices = zambian.fetch_iapri_data()
-    print(f"   IAPRI: {len(iapri_prices)} prices")
+    for (title, label, _), future in zip(fetchers, futures):
+        print(f"\n{title}")
+        print(f"   {label}: {len(future.result())} prices")
     
     print("\n5. Testing historical data...")
     historical = zambian.load_historical_prices()
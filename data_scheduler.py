@@ -7,14 +7,18 @@ import schedule
 import time
 import threading
 import json
+import hashlib
 import os
+import queue
 import sqlite3
-import zipfile
-import shutil
-import hashlib
 import random
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import product
+from operator import itemgetter
+from typing import List, Dict
 
 # Import from your existing modules
 # FIRST: Import ZambianMarketData directly BEFORE importing from app
@@ -34,30 +38,165 @@ except ImportError as e:
         @staticmethod
         def fetch_all_sources():
             return []
-# =========================================================
-# DATA SCHEDULER CLASS
-# =========================================================
 
-class DataScheduler:
-    """Automated data collection and management scheduler"""
+# Optional: orjson serializes reports in C; stdlib json is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+DATABASE = 'farm_market.db'
+
+# Identical admin notifications within this many seconds are stored only once
+_NOTIFY_TTL = 300
+
+# Concurrent SMS gateway requests for the daily summaries (keep within the provider's rate limit)
+SMS_SEND_WORKERS = int(os.getenv('SMS_SEND_WORKERS', '16'))
+
+# WAL lets the web app keep reading while scheduled jobs write; NORMAL sync is
+# durable in WAL mode with one fsync per checkpoint instead of two per commit
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+# One price per market, commodity and day: lets price saves use a single UPSERT
+# instead of a SELECT per row (and the date() lookup is served by the index)
+PRICE_UPSERT_INDEX_SQL = """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_market_prices_unique 
+    ON market_prices(market, commodity, date(recorded_at))
+"""
+
+# Indexes for the scheduler's hot reads: latest verified price per commodity
+# (SMS summaries), per-day counts (daily report) and SMS recipients
+SCHEDULER_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_prices_commodity_verified_recorded ON market_prices(commodity, verified, recorded_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_prices_recorded ON market_prices(recorded_at)",
+    "CREATE INDEX IF NOT EXISTS idx_users_sms_status ON users(sms_alerts, status)",
+)
+
+def _create_indexes(conn):
+    """Create the scheduler's read indexes (skipping tables that don't exist yet)"""
+    for index_sql in SCHEDULER_INDEXES:
+        try:
+            conn.execute(index_sql)
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  Skipped index: {e}")
+
+# Log/notification tables written in batches by DataScheduler._flush_logs()
+LOG_TABLES_SQL = (
+    """CREATE TABLE IF NOT EXISTS collection_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_name TEXT,
+        operation TEXT,
+        records_collected INTEGER,
+        status TEXT,
+        error_message TEXT,
+        duration_seconds REAL,
+        collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS activity_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user TEXT,
+        action TEXT,
+        details TEXT,
+        ip_address TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS admin_notifications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        message TEXT NOT NULL,
+        type TEXT DEFAULT 'info',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        read_status INTEGER DEFAULT 0
+    )""",
+)
+
+# Queued log rows are written after each scheduler tick, or as soon as this many pile up
+LOG_FLUSH_BATCH = 50
+
+# Module-level so every flush hands sqlite3 the same statement strings
+LOG_INSERT_SQL = {
+    "collection_logs": """
+        INSERT INTO collection_logs 
+        (source_name, operation, records_collected, status, error_message, duration_seconds, collected_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+    "activity_logs": """
+        INSERT INTO activity_logs (user, action, details, ip_address, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    "admin_notifications": """
+        INSERT INTO admin_notifications (message, type, created_at)
+        VALUES (?, ?, ?)
+    """,
+}
+
+# Column order of MockZambianData.fetch_all_sources(as_tuples=True) rows, which
+# _save_prices_to_database_safe() accepts in place of dicts
+PRICE_ROW_FIELDS = ("market", "commodity", "price", "unit", "volume", "quality", "source",
+                    "verified", "recorded_at", "price_trend", "region")
+_price_row = itemgetter(*PRICE_ROW_FIELDS)
+
+@lru_cache(maxsize=64)
+def _price_save_sql(table_columns: frozenset):
+    """
+    SQL for saving prices into a market_prices table with the given columns, built once per
+    schema: (insert_optional, update_optional, insert_sql, upsert_sql, update_sql)
+    """
+    update_optional = tuple(col for col in ('volume', 'quality', 'region', 'price_trend')
+                            if col in table_columns)
+    insert_optional = tuple(col for col in ('volume', 'quality', 'region', 'market_lat',
+                                            'market_lon', 'price_trend', 'collected_at')
+                            if col in table_columns)
     
-    def __init__(self):
-        self.running = False
-        self.schedule_thread = None
-        self.backup_dir = "backups"
-        self.log_dir = "logs"
-        
-        # Create necessary directories
-        self._create_directories()
-        
-        # Initialize data collector - use directly imported ZambianMarketData
-        if ZAMBIAN_MODULE_AVAILABLE:
-            self.market_data = ZambianMarketData()
-        else:
-            print("⚠️  Running in simulation mode - using mock data")
-            self.market_data = MockZambianData()
+    # Optional values a price doesn't carry are bound as NULL: updates keep the
+    # stored value and collected_at falls back to its column default
+    insert_cols = ("market", "commodity", "price", "unit", "source", "verified",
+                   "recorded_at", *insert_optional)
+    placeholders = ["COALESCE(?, CURRENT_TIMESTAMP)" if col == 'collected_at' else "?"
+                    for col in insert_cols]
+    insert_sql = (f"INSERT INTO market_prices ({', '.join(insert_cols)}) "
+                  f"VALUES ({', '.join(placeholders)})")
+    
+    # A second price for the same market, commodity and day updates the first
+    upsert_sql = (
+        insert_sql
+        + " ON CONFLICT(market, commodity, date(recorded_at)) DO UPDATE SET"
+        + " price = excluded.price, unit = excluded.unit, source = excluded.source,"
+        + " verified = excluded.verified, recorded_at = excluded.recorded_at"
+        + "".join(f", {col} = COALESCE(excluded.{col}, {col})" for col in update_optional)
+    )
     
-    # Other methods remain the same...
+    update_sql = (
+        "UPDATE market_prices SET price = ?, unit = ?, source = ?, verified = ?, recorded_at = ?"
+        + "".join(f", {col} = COALESCE(?, {col})" for col in update_optional)
+        + " WHERE id = ?"
+    )
+    return insert_optional, update_optional, insert_sql, upsert_sql, update_sql
+
+def _write_json_report(path, report):
+    """Write a report as indented JSON to a temp file, then swap it in atomically"""
+    tmp_path = f"{path}.tmp"
+    # Serialize first and write the payload in one call (json.dump writes token by token)
+    if ORJSON_AVAILABLE:
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, 'w', buffering=65536) as f:
+            f.write(json.dumps(report, indent=2))
+    os.replace(tmp_path, path)
+
+def _apply_pragmas(conn):
+    """Apply the scheduler's SQLite tuning PRAGMAs to a new connection"""
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
 
 # =========================================================
 # DATA SCHEDULER CLASS
@@ -71,6 +210,23 @@ class DataScheduler:
         self.schedule_thread = None
         self.backup_dir = "backups"
         self.log_dir = "logs"
+        self._schema_cache: Dict[str, set] = {}  # table -> column names, see _columns_of()
+        self._price_upsert = None  # unique index available? see _ensure_price_upsert_index()
+        
+        # Log/notification rows are queued by the jobs and written in batches
+        self._log_queue = queue.SimpleQueue()
+        self._log_tables_ready = False
+        self._notify_cache: Dict[str, float] = {}  # message digest -> last sent (monotonic)
+        
+        # Set by stop_scheduler() to wake the scheduler loop immediately
+        self._stop_event = threading.Event()
+        
+        # Jobs registered by start_scheduler(), in registration order (for status output)
+        self._job_refs = []
+        
+        # One long-lived connection shared by all jobs (see _db())
+        self._conn = None
+        self._conn_lock = threading.RLock()
         
         # Create necessary directories
         self._create_directories()
@@ -104,7 +260,11 @@ class DataScheduler:
             
             # Collect from all Zambian sources
             print("📊 Collecting data from Zambian sources...")
-            prices = self.market_data.fetch_all_sources()
+            if ZAMBIAN_MODULE_AVAILABLE:
+                prices = self.market_data.fetch_all_sources()
+            else:
+                # Mock rows come as tuples in PRICE_ROW_FIELDS order, bound as-is by the writer
+                prices = self.market_data.fetch_all_sources(as_tuples=True)
             
             # Save to database with schema-safe method
             saved_count = self._save_prices_to_database_safe(prices)
@@ -143,92 +303,84 @@ class DataScheduler:
     
     def collect_hourly_updates(self):
         """Hourly price updates - runs at :30 past each hour (8:30-17:30)"""
-        current_hour = datetime.now().hour
+        now = datetime.now()
         
-        # Only run during market hours (8 AM to 6 PM)
-        if 8 <= current_hour < 18:
-            print(f"⏰ [{datetime.now().strftime('%H:%M:%S')}] Hourly market update...")
-            
-            try:
-                # Collect from primary sources only
-                prices = []
-                
-                if ZAMBIAN_MODULE_AVAILABLE:
-                    # Get ZNFU prices (most reliable)
-                    znfu_prices = self.market_data.fetch_znfu_prices()
-                    if znfu_prices:
-                        prices.extend(znfu_prices[:15])  # Limit to 15 records
-                    
-                    # Get Ministry of Agriculture prices
-                    maco_prices = self.market_data.fetch_maco_prices()
-                    if maco_prices:
-                        prices.extend(maco_prices[:10])  # Limit to 10 records
-                else:
-                    # Generate mock data for simulation
-                    prices = self.market_data.generate_hourly_update()
-                
-                # Save to database with schema-safe method
-                saved_count = self._save_prices_to_database_safe(prices)
-                
-                # Log the update
-                self._log_collection_activity(
-                    operation="hourly_update",
-                    records_collected=saved_count,
-                    duration=0,
-                    status="success"
-                )
-                
-                print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Hourly update: {saved_count} records")
-                
-            except Exception as e:
-                print(f"⚠️  Hourly update failed: {e}")
-    
-    def update_market_status(self):
-        """Update market status and metadata - runs at 7:00 AM"""
-        print(f"🏪 [{datetime.now().strftime('%H:%M:%S')}] Updating market status...")
+        # Only run during market hours (8 AM to 6 PM); nothing is scheduled outside
+        # them, this guards manual run_once_now("hourly") calls
+        if not 8 <= now.hour < 18:
+            return
+        
+        print(f"⏰ [{now.strftime('%H:%M:%S')}] Hourly market update...")
         
         try:
-            conn = self._get_db_connection()
-            cur = conn.cursor()
+            # Collect from primary sources only
+            prices = []
+            
+            if ZAMBIAN_MODULE_AVAILABLE:
+                # Get ZNFU prices (most reliable)
+                znfu_prices = self.market_data.fetch_znfu_prices()
+                if znfu_prices:
+                    prices.extend(znfu_prices[:15])  # Limit to 15 records
+                
+                # Get Ministry of Agriculture prices
+                maco_prices = self.market_data.fetch_maco_prices()
+                if maco_prices:
+                    prices.extend(maco_prices[:10])  # Limit to 10 records
+            else:
+                # Generate mock data for simulation
+                prices = self.market_data.generate_hourly_update()
             
-            # Get current day
-            today = datetime.now().strftime("%A")
+            # Save to database with schema-safe method
+            saved_count = self._save_prices_to_database_safe(prices)
             
-            # Update market status based on market days
-            cur.execute("""
-                SELECT name, region, market_days FROM markets WHERE active = 1
-            """)
-            markets = cur.fetchall()
+            # Log the update
+            self._log_collection_activity(
+                operation="hourly_update",
+                records_collected=saved_count,
+                duration=0,
+                status="success"
+            )
             
-            # Check if is_open_today column exists
-            cur.execute("PRAGMA table_info(markets)")
-            columns = [col[1] for col in cur.fetchall()]
+            print(f"✅ [{datetime.now().strftime('%H:%M:%S')}] Hourly update: {saved_count} records")
             
-            for market in markets:
-                name, region, market_days = market
-                market_days_list = market_days.split(',') if market_days else []
+        except Exception as e:
+            print(f"⚠️  Hourly update failed: {e}")
+
+    def update_market_status(self):
+        """Update market status and metadata - runs at 7:00 AM"""
+        print(f"🏪 [{datetime.now().strftime('%H:%M:%S')}] Updating market status...")
+        
+        try:
+            with self._db() as conn:
+                cur = conn.cursor()
                 
-                # Check if today is a market day
-                is_open = today in market_days_list
+                # Get current day
+                now = datetime.now()
+                today = now.strftime("%A")
                 
-                # Update last updated timestamp
+                # Check if is_open_today column exists
+                columns = self._columns_of('markets')
+                
+                # Update every active market in one statement; a market is open when
+                # today is one of its comma-separated market days
                 if 'is_open_today' in columns:
                     cur.execute("""
                         UPDATE markets 
-                        SET last_updated = ?, is_open_today = ?
-                        WHERE name = ?
-                    """, (datetime.now().isoformat(), int(is_open), name))
+                        SET last_updated = ?,
+                            is_open_today = CASE WHEN ',' || market_days || ',' GLOB ? THEN 1 ELSE 0 END
+                        WHERE active = 1
+                    """, (now.isoformat(), f"*,{today},*"))
                 else:
                     cur.execute("""
                         UPDATE markets 
                         SET last_updated = ?
-                        WHERE name = ?
-                    """, (datetime.now().isoformat(), name))
-            
-            conn.commit()
-            conn.close()
+                        WHERE active = 1
+                    """, (now.isoformat(),))
+                updated_count = cur.rowcount
+                
+                conn.commit()
             
-            print(f"✅ Market status updated for {len(markets)} markets")
+            print(f"✅ Market status updated for {updated_count} markets")
             
         except Exception as e:
             print(f"⚠️  Market status update failed: {e}")
@@ -241,36 +393,37 @@ class DataScheduler:
             # Import SMS service
             from app import sms_service
             
-            conn = self._get_db_connection()
-            cur = conn.cursor()
-            
-            # Get users with SMS alerts enabled
-            cur.execute("""
-                SELECT user_id, phone, name, location, main_crops 
-                FROM users 
-                WHERE sms_alerts = 1 AND status = 'active'
-            """)
-            users = cur.fetchall()
-            
-            sent_count = 0
-            for user in users:
-                user_id, phone, name, location, main_crops = user
+            with self._db() as conn:
+                cur = conn.cursor()
+                
+                # Get users with SMS alerts enabled (only the columns the message needs),
+                # with each user's first three main crops parsed once up front
+                cur.execute("""
+                    SELECT phone, name, location, COALESCE(NULLIF(main_crops, ''), 'Maize,Tomatoes') 
+                    FROM users 
+                    WHERE sms_alerts = 1 AND status = 'active'
+                """)
+                users = [(phone, name, location, [crop.strip() for crop in main_crops.split(',')[:3]])
+                         for phone, name, location, main_crops in cur.fetchall()]
                 
+                # Latest verified price per commodity, one query for every user
+                cur.execute("""
+                    SELECT commodity, price, market FROM market_prices 
+                    WHERE verified = 1 AND (commodity, recorded_at) IN (
+                        SELECT commodity, MAX(recorded_at) FROM market_prices 
+                        WHERE verified = 1 GROUP BY commodity
+                    )
+                """)
+                latest = {commodity: (price, market) for commodity, price, market in cur.fetchall()}
+            
+            messages = []
+            for phone, name, location, crops in users:
                 try:
-                    # Get user's main crops
-                    crops = main_crops.split(',')[:3] if main_crops else ["Maize", "Tomatoes"]
-                    
                     # Get latest prices for user's crops
                     message = f"FarmConnect Daily for {name}:\n"
                     
                     for crop in crops:
-                        crop = crop.strip()
-                        cur.execute("""
-                            SELECT price, market FROM market_prices 
-                            WHERE commodity = ? AND verified = 1 
-                            ORDER BY recorded_at DESC LIMIT 1
-                        """, (crop,))
-                        price_data = cur.fetchone()
+                        price_data = latest.get(crop)
                         
                         if price_data:
                             message += f"{crop}: ZMW {price_data[0]} at {price_data[1]}\n"
@@ -279,16 +432,23 @@ class DataScheduler:
                     
                     # Add footer
                     message += f"\nMarket in {location} active today. Dial *123# for live prices."
-                    
-                    # Send SMS (demo or real)
-                    result = sms_service.send_sms(phone, message)
-                    if result.get("success"):
-                        sent_count += 1
+                    messages.append((phone, message))
                         
                 except Exception as e:
                     print(f"⚠️  Failed to send to {phone}: {e}")
             
-            conn.close()
+            def send(phone_message):
+                """Send one SMS (demo or real); True on success"""
+                phone, message = phone_message
+                try:
+                    return bool(sms_service.send_sms(phone, message).get("success"))
+                except Exception as e:
+                    print(f"⚠️  Failed to send to {phone}: {e}")
+                    return False
+            
+            # Sends are network round-trips, so overlap them (bounded for the provider's rate limit)
+            with ThreadPoolExecutor(max_workers=SMS_SEND_WORKERS) as executor:
+                sent_count = sum(executor.map(send, messages))
             
             print(f"✅ Sent {sent_count} daily summaries")
             
@@ -304,17 +464,33 @@ class DataScheduler:
         print(f"💾 [{datetime.now().strftime('%H:%M:%S')}] Creating daily backup...")
         
         try:
+            import tempfile
+            import zipfile  # only the nightly backup job needs these
+            
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_name = f"farmconnect_backup_{timestamp}"
             zip_path = os.path.join(self.backup_dir, f"{backup_name}.zip")
             
-            # Create ZIP archive
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Backup database
-                db_path = "farm_market.db"
-                if os.path.exists(db_path):
-                    zipf.write(db_path, "farm_market.db")
-                    print(f"✅ Database backed up: {os.path.getsize(db_path)} bytes")
+            # Create ZIP archive (fastest deflate level: zlib CPU time dominates the job,
+            # and database pages still compress well; ZIP64 for databases over 4 GB)
+            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED,
+                                 compresslevel=1, allowZip64=True) as zipf:
+                # Backup database: a consistent snapshot through SQLite's online backup
+                # API (safe while WAL writers are active), staged next to the archive
+                if os.path.exists(DATABASE):
+                    fd, snapshot_path = tempfile.mkstemp(suffix='.db', dir=self.backup_dir)
+                    os.close(fd)
+                    try:
+                        snapshot = sqlite3.connect(snapshot_path)
+                        try:
+                            with self._db() as conn:
+                                conn.backup(snapshot, pages=1024)
+                        finally:
+                            snapshot.close()
+                        zipf.write(snapshot_path, "farm_market.db")
+                        print(f"✅ Database backed up: {os.path.getsize(snapshot_path)} bytes")
+                    finally:
+                        os.unlink(snapshot_path)
                 
                 # Backup configuration
                 config_files = ['config.json', '.env', 'requirements.txt']
@@ -322,11 +498,12 @@ class DataScheduler:
                     if os.path.exists(config_file):
                         zipf.write(config_file, config_file)
                 
-                # Backup logs
-                log_files = [f for f in os.listdir(self.log_dir) if f.endswith('.log')]
-                for log_file in log_files[:5]:  # Limit to 5 most recent logs
-                    log_path = os.path.join(self.log_dir, log_file)
-                    zipf.write(log_path, f"logs/{log_file}")
+                # Backup logs (scandir entries carry their stat, so sorting by mtime is cheap)
+                with os.scandir(self.log_dir) as it:
+                    log_entries = [entry for entry in it if entry.is_file() and entry.name.endswith('.log')]
+                log_entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+                for entry in log_entries[:5]:  # Limit to 5 most recent logs
+                    zipf.write(entry.path, f"logs/{entry.name}")
             
             # Clean up old backups (keep last 30 days)
             self._cleanup_old_backups()
@@ -347,44 +524,56 @@ class DataScheduler:
         print(f"🧹 [{datetime.now().strftime('%H:%M:%S')}] Cleaning up old data...")
         
         try:
-            conn = self._get_db_connection()
-            cur = conn.cursor()
-            
-            # Delete prices older than 180 days
-            cutoff_date = (datetime.now() - timedelta(days=180)).isoformat()
-            cur.execute("""
-                DELETE FROM market_prices 
-                WHERE recorded_at < ?
-            """, (cutoff_date,))
-            
-            deleted_prices = cur.rowcount
-            
-            # Delete old logs if table exists
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='collection_logs'")
-            if cur.fetchone():
-                cutoff_date = (datetime.now() - timedelta(days=90)).isoformat()
-                cur.execute("""
-                    DELETE FROM collection_logs 
-                    WHERE collected_at < ?
-                """, (cutoff_date,))
-                deleted_logs = cur.rowcount
-            else:
-                deleted_logs = 0
-            
-            # Delete old SMS history if table exists
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='sms_history'")
-            if cur.fetchone():
-                cutoff_date = (datetime.now() - timedelta(days=60)).isoformat()
+            with self._db() as conn:
+                cur = conn.cursor()
+                
+                # All three deletes commit together
+                cur.execute("BEGIN IMMEDIATE")
+                
+                # Delete prices older than 180 days (range seek on idx_prices_recorded)
+                cutoff_date = (datetime.now() - timedelta(days=180)).isoformat()
                 cur.execute("""
-                    DELETE FROM sms_history 
-                    WHERE sent_at < ?
+                    DELETE FROM market_prices 
+                    WHERE recorded_at < ?
                 """, (cutoff_date,))
-                deleted_sms = cur.rowcount
-            else:
-                deleted_sms = 0
-            
-            conn.commit()
-            conn.close()
+                
+                deleted_prices = cur.rowcount
+                
+                # Delete old logs if table exists
+                cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='collection_logs'")
+                if cur.fetchone():
+                    cutoff_date = (datetime.now() - timedelta(days=90)).isoformat()
+                    cur.execute("""
+                        DELETE FROM collection_logs 
+                        WHERE collected_at < ?
+                    """, (cutoff_date,))
+                    deleted_logs = cur.rowcount
+                else:
+                    deleted_logs = 0
+                
+                # Delete old SMS history if table exists
+                cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='sms_history'")
+                if cur.fetchone():
+                    cutoff_date = (datetime.now() - timedelta(days=60)).isoformat()
+                    cur.execute("""
+                        DELETE FROM sms_history 
+                        WHERE sent_at < ?
+                    """, (cutoff_date,))
+                    deleted_sms = cur.rowcount
+                else:
+                    deleted_sms = 0
+                
+                conn.commit()
+                
+                # Reclaim freed pages without a full rewrite; the first run switches the
+                # database to incremental auto-vacuum, which takes one VACUUM to apply
+                if cur.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    cur.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                    cur.execute("VACUUM")
+                cur.execute("PRAGMA incremental_vacuum(1000)").fetchall()
+                
+                # Refresh optimizer statistics after a large delete
+                cur.execute("ANALYZE market_prices")
             
             print(f"✅ Cleanup complete:")
             print(f"   - Deleted {deleted_prices} old prices")
@@ -404,57 +593,46 @@ class DataScheduler:
         print(f"📈 [{datetime.now().strftime('%H:%M:%S')}] Generating daily report...")
         
         try:
-            conn = self._get_db_connection()
-            cur = conn.cursor()
-            
-            # Get statistics for the day
-            today = datetime.now().strftime("%Y-%m-%d")
-            
-            # User statistics
-            cur.execute("SELECT COUNT(*) FROM users WHERE status='active'")
-            total_users = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM users WHERE created_at LIKE ?", (f"{today}%",))
-            new_users_today = cur.fetchone()[0]
-            
-            # Price statistics
-            cur.execute("SELECT COUNT(*) FROM market_prices WHERE recorded_at LIKE ?", (f"{today}%",))
-            prices_today = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM market_prices WHERE verified=1")
-            total_verified = cur.fetchone()[0]
-            
-            # SMS statistics if table exists
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='sms_history'")
-            if cur.fetchone():
-                cur.execute("SELECT COUNT(*) FROM sms_history WHERE sent_at LIKE ?", (f"{today}%",))
-                sms_today = cur.fetchone()[0]
-            else:
-                sms_today = 0
-            
-            # Generate report
-            report = {
-                "date": today,
-                "users": {
-                    "total": total_users,
-                    "new_today": new_users_today
-                },
-                "prices": {
-                    "collected_today": prices_today,
-                    "total_verified": total_verified
-                },
-                "sms": {
-                    "sent_today": sms_today
-                },
-                "generated_at": datetime.now().isoformat()
-            }
-            
-            # Save report to file
-            report_path = os.path.join(self.log_dir, f"daily_report_{today}.json")
-            with open(report_path, 'w') as f:
-                json.dump(report, f, indent=2)
-            
-            conn.close()
+            with self._db() as conn:
+                cur = conn.cursor()
+                
+                # Get statistics for the day (half-open range so the indexes are used)
+                today = datetime.now().strftime("%Y-%m-%d")
+                tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+                
+                # User, price and SMS statistics in one round trip (SMS only if the table exists)
+                sms_today_sql = ("(SELECT COUNT(*) FROM sms_history WHERE sent_at >= :today AND sent_at < :tomorrow)"
+                                 if self._columns_of('sms_history') else "0")
+                cur.execute(f"""
+                    SELECT
+                        (SELECT COUNT(*) FROM users WHERE status = 'active'),
+                        (SELECT COUNT(*) FROM users WHERE created_at >= :today AND created_at < :tomorrow),
+                        (SELECT COUNT(*) FROM market_prices WHERE recorded_at >= :today AND recorded_at < :tomorrow),
+                        (SELECT COUNT(*) FROM market_prices WHERE verified = 1),
+                        {sms_today_sql}
+                """, {"today": today, "tomorrow": tomorrow})
+                total_users, new_users_today, prices_today, total_verified, sms_today = cur.fetchone()
+                
+                # Generate report
+                report = {
+                    "date": today,
+                    "users": {
+                        "total": total_users,
+                        "new_today": new_users_today
+                    },
+                    "prices": {
+                        "collected_today": prices_today,
+                        "total_verified": total_verified
+                    },
+                    "sms": {
+                        "sent_today": sms_today
+                    },
+                    "generated_at": datetime.now().isoformat()
+                }
+                
+                # Save report to file
+                report_path = os.path.join(self.log_dir, f"daily_report_{today}.json")
+                _write_json_report(report_path, report)
             
             print(f"✅ Daily report saved: {report_path}")
             
@@ -470,16 +648,22 @@ class DataScheduler:
     # SCHEDULER MANAGEMENT
     # =====================================================
     
-    def start_scheduler(self):
-        """Start all scheduled jobs"""
+    def start_scheduler(self, background: bool = True):
+        """Start all scheduled jobs (background=False: the caller drives run_due_jobs())"""
         if self.running:
             print("⚠️  Scheduler already running")
             return
         
         print("🚀 Starting data scheduler...")
         
-        # Clear existing schedules
+        # Clear existing schedules (and re-read table schemas, a migration may have run)
         schedule.clear()
+        self._job_refs.clear()
+        self._schema_cache.clear()
+        self._price_upsert = None
+        
+        with self._db() as conn:
+            _create_indexes(conn)
         
         # ============ DAILY JOBS ============
         
@@ -512,44 +696,64 @@ class DataScheduler:
         # First day of month - Generate monthly report
         schedule.every().monday.at("03:00").do(self.generate_monthly_report)
         
+        # Snapshot the registered jobs once; status output reads this list
+        self._job_refs.extend(schedule.jobs)
+        
         # Start the scheduler thread
         self.running = True
-        self.schedule_thread = threading.Thread(target=self._run_scheduler_loop, daemon=True)
-        self.schedule_thread.start()
+        self._stop_event.clear()
+        if background:
+            self.schedule_thread = threading.Thread(target=self._run_scheduler_loop, daemon=True)
+            self.schedule_thread.start()
         
         print("✅ Data scheduler started successfully!")
         print("\n📅 Scheduled Jobs:")
-        for job in schedule.get_jobs():
+        for job in self._job_refs:
             print(f"   • {job}")
         print()
         
         # Log scheduler start
         self._log_system_activity("scheduler_start", "Data scheduler started")
+        self._flush_logs()
+    
+    def run_due_jobs(self) -> float:
+        """Run any due jobs and return the seconds to wait before the next one"""
+        try:
+            schedule.run_pending()
+        except Exception as e:
+            print(f"⚠️  Scheduler error: {e}")
+        
+        # Write whatever the jobs logged in one transaction
+        self._flush_logs()
+        
+        # Sleep until the next job is due instead of polling every minute (capped at an hour)
+        idle = schedule.idle_seconds()
+        return 300 if idle is None else max(1, min(idle, 3600))
     
     def _run_scheduler_loop(self):
         """Run the scheduler loop in background thread"""
         print("⏰ Scheduler loop running...")
         
         while self.running:
-            try:
-                schedule.run_pending()
-            except Exception as e:
-                print(f"⚠️  Scheduler error: {e}")
-            
-            time.sleep(60)  # Check every minute
+            # stop_scheduler() wakes us right away
+            self._stop_event.wait(timeout=self.run_due_jobs())
     
     def stop_scheduler(self):
         """Stop the scheduler"""
         print("🛑 Stopping data scheduler...")
         
         self.running = False
+        self._stop_event.set()
         schedule.clear()
+        self._job_refs.clear()
         
         if self.schedule_thread:
             self.schedule_thread.join(timeout=5)
         
         print("✅ Data scheduler stopped")
         self._log_system_activity("scheduler_stop", "Data scheduler stopped")
+        self._flush_logs()
+        self._close_db_connection()
     
     def run_once_now(self, job_name):
         """Run a specific job immediately"""
@@ -571,270 +775,260 @@ class DataScheduler:
             self.send_daily_summaries()
         else:
             print(f"⚠️  Unknown job: {job_name}")
+        
+        # Manual runs are checked right away, so don't wait for the next tick
+        self._flush_logs()
     
     # =====================================================
     # DATABASE HELPER METHODS (Schema-safe)
     # =====================================================
     
     def _get_db_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect('farm_market.db')
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get the shared database connection (WAL, NORMAL sync, 5s busy timeout)"""
+        if self._conn is None:
+            # Jobs run on the scheduler thread and run_once_now() callers; _db() serializes them.
+            # Autocommit mode: multi-statement writes open their own BEGIN, so Python's
+            # implicit transactions are never needed. Rows stay plain tuples (no sqlite3.Row).
+            # A larger statement cache keeps every job's prepared SQL (module-level
+            # constants like LOG_INSERT_SQL and _price_save_sql()) compiled across runs
+            self._conn = _apply_pragmas(sqlite3.connect(DATABASE, check_same_thread=False,
+                                                        isolation_level=None,
+                                                        cached_statements=256))
+        return self._conn
+    
+    def _columns_of(self, table: str) -> set:
+        """Column names of a table, read with PRAGMA table_info once and then memoized"""
+        columns = self._schema_cache.get(table)
+        if columns is None:
+            with self._db() as conn:
+                columns = {col[1] for col in conn.execute(f"PRAGMA table_info({table})")}
+            if columns:  # don't remember a table that doesn't exist yet
+                self._schema_cache[table] = columns
+        return columns
+    
+    def _ensure_price_upsert_index(self) -> bool:
+        """Create the unique index the price UPSERT relies on (False if it can't exist yet)"""
+        if self._price_upsert is None:
+            with self._db() as conn:
+                try:
+                    conn.execute(PRICE_UPSERT_INDEX_SQL)
+                    self._price_upsert = True
+                except sqlite3.IntegrityError:
+                    # Older databases may already hold several prices for the same day
+                    print("⚠️  Duplicate daily prices found - saving without the UPSERT index")
+                    self._price_upsert = False
+        return self._price_upsert
+    
+    @contextmanager
+    def _db(self):
+        """Borrow the shared connection, holding the lock for the whole block"""
+        with self._conn_lock:
+            conn = self._get_db_connection()
+            try:
+                yield conn
+            except BaseException:
+                # Don't leave a half-finished transaction on the shared connection
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+    
+    def _close_db_connection(self):
+        """Close the shared connection (reopened on next use)"""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._log_tables_ready = False
     
-    def _save_prices_to_database_safe(self, prices: List[Dict]) -> int:
+    def _save_prices_to_database_safe(self, prices: List) -> int:
         """
         Save prices to database with schema-safe approach
-        Handles missing columns gracefully
+        Handles missing columns gracefully; the whole batch is one transaction
+        Prices are dicts, or tuples in PRICE_ROW_FIELDS order
         """
         if not prices:
             return 0
         
-        saved_count = 0
-        conn = self._get_db_connection()
-        cur = conn.cursor()
+        upsert = self._ensure_price_upsert_index()
         
-        # Get table columns
-        cur.execute("PRAGMA table_info(market_prices)")
-        columns = [col[1] for col in cur.fetchall()]
-        
-        for price in prices:
-            try:
-                # Build safe insert based on available columns
-                # Always try basic columns first
-                market = price.get('market', 'Unknown Market')
-                commodity = price.get('commodity', 'Unknown')
-                price_value = price.get('price', 0.0)
-                unit = price.get('unit', 'ZMW/kg')
-                source = price.get('source', 'Zambian_Source')
-                verified = price.get('verified', 1)
-                recorded_at = price.get('recorded_at', datetime.now().isoformat())
-                
-                # Check if record exists for today
+        with self._db() as conn:
+            cur = conn.cursor()
+            
+            # Get table columns
+            columns = self._columns_of('market_prices')
+            
+            # Without the unique index, match today's records by id (loaded in one query)
+            existing = {}
+            if not upsert:
                 today = datetime.now().strftime("%Y-%m-%d")
                 cur.execute("""
-                    SELECT id FROM market_prices 
-                    WHERE market = ? AND commodity = ? AND date(recorded_at) = ?
-                """, (market, commodity, today))
+                    SELECT market, commodity, id FROM market_prices 
+                    WHERE date(recorded_at) = ?
+                """, (today,))
+                existing = {(market, commodity): record_id for market, commodity, record_id in cur.fetchall()}
+            now_iso = datetime.now().isoformat()
+            
+            def build_statements(optional_columns):
+                """One statement shape for the whole batch (UPSERT, or UPDATE + INSERT), run with executemany"""
+                insert_optional, update_optional, insert_sql, upsert_sql, update_sql = \
+                    _price_save_sql(frozenset(optional_columns))
                 
-                existing_record = cur.fetchone()
-                
-                if existing_record:
-                    # Update existing record
-                    update_query = """
-                        UPDATE market_prices 
-                        SET price = ?, unit = ?, source = ?, verified = ?, recorded_at = ?
-                    """
-                    update_params = [price_value, unit, source, verified, recorded_at]
-                    
-                    # Add optional columns if they exist
-                    if 'volume' in columns and 'volume' in price:
-                        update_query += ", volume = ?"
-                        update_params.append(price.get('volume'))
-                    
-                    if 'quality' in columns and 'quality' in price:
-                        update_query += ", quality = ?"
-                        update_params.append(price.get('quality'))
-                    
-                    if 'region' in columns and 'region' in price:
-                        update_query += ", region = ?"
-                        update_params.append(price.get('region'))
-                    
-                    if 'price_trend' in columns and 'price_trend' in price:
-                        update_query += ", price_trend = ?"
-                        update_params.append(price.get('price_trend'))
-                    
-                    # Add WHERE clause
-                    update_query += " WHERE id = ?"
-                    update_params.append(existing_record['id'])
-                    
-                    cur.execute(update_query, update_params)
+                if isinstance(prices[0], tuple):
+                    # Already in column order: pick the fields this statement binds
+                    positions = [PRICE_ROW_FIELDS.index(col) if col in PRICE_ROW_FIELDS else None
+                                 for col in ("market", "commodity", "price", "unit", "source",
+                                             "verified", "recorded_at", *insert_optional)]
+                    rows = [tuple(None if i is None else price[i] for i in positions)
+                            for price in prices]
                 else:
-                    # Insert new record
-                    insert_cols = ["market", "commodity", "price", "unit", "source", "verified", "recorded_at"]
-                    insert_vals = [market, commodity, price_value, unit, source, verified, recorded_at]
-                    placeholders = ["?"] * len(insert_vals)
-                    
-                    # Add optional columns if they exist in table
-                    optional_cols = [
-                        ('volume', 'volume'),
-                        ('quality', 'quality'),
-                        ('region', 'region'),
-                        ('market_lat', 'market_lat'),
-                        ('market_lon', 'market_lon'),
-                        ('price_trend', 'price_trend'),
-                        ('collected_at', 'collected_at')
-                    ]
-                    
-                    for price_key, col_name in optional_cols:
-                        if col_name in columns and price_key in price:
-                            insert_cols.append(col_name)
-                            insert_vals.append(price[price_key])
-                            placeholders.append("?")
-                    
-                    # Build and execute insert
-                    insert_query = f"""
-                        INSERT INTO market_prices ({', '.join(insert_cols)})
-                        VALUES ({', '.join(placeholders)})
-                    """
-                    
-                    cur.execute(insert_query, insert_vals)
+                    rows = [(
+                        price.get('market', 'Unknown Market'),
+                        price.get('commodity', 'Unknown'),
+                        price.get('price', 0.0),
+                        price.get('unit', 'ZMW/kg'),
+                        price.get('source', 'Zambian_Source'),
+                        price.get('verified', 1),
+                        price.get('recorded_at', now_iso),
+                        *[price.get(col) for col in insert_optional]
+                    ) for price in prices]
+                
+                if upsert:
+                    return [(upsert_sql, rows)]
                 
-                saved_count += 1
+                update_rows, insert_rows = [], {}
+                for row in rows:
+                    record_id = existing.get(row[:2])
+                    if record_id is not None:
+                        # Update existing record
+                        optional = dict(zip(insert_optional, row[7:]))
+                        update_rows.append((*row[2:7], *[optional[col] for col in update_optional], record_id))
+                    else:
+                        # Insert new record; a market/commodity repeated within the batch
+                        # keeps its latest values
+                        insert_rows[row[:2]] = row
                 
-            except Exception as e:
-                print(f"⚠️  Error saving price record: {e}")
-                # Try simpler insert as fallback
+                return [(update_sql, update_rows), (insert_sql, list(insert_rows.values()))]
+            
+            saved_count = 0
+            # Try with every optional column first, then fall back to the basic columns
+            for optional_columns in (columns, set()):
                 try:
-                    cur.execute("""
-                        INSERT INTO market_prices (market, commodity, price, unit, source, verified, recorded_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (market, commodity, price_value, unit, source, verified, recorded_at))
-                    saved_count += 1
-                except Exception as e2:
-                    print(f"⚠️  Even simple insert failed: {e2}")
-                    continue
-        
-        conn.commit()
-        conn.close()
+                    cur.execute("BEGIN IMMEDIATE")
+                    for sql, rows in build_statements(optional_columns):
+                        cur.executemany(sql, rows)
+                        saved_count += len(rows)
+                    conn.commit()
+                    break
+                except Exception as e:
+                    conn.rollback()
+                    saved_count = 0
+                    print(f"⚠️  Error saving price batch: {e}")
         
         return saved_count
     
     def _log_collection_activity(self, operation: str, records_collected: int, 
                                 duration: float, status: str, error_message: str = None):
-        """Log data collection activity - creates table if needed"""
-        try:
-            conn = self._get_db_connection()
-            cur = conn.cursor()
-            
-            # Create table if it doesn't exist
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS collection_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    source_name TEXT,
-                    operation TEXT,
-                    records_collected INTEGER,
-                    status TEXT,
-                    error_message TEXT,
-                    duration_seconds REAL,
-                    collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            cur.execute("""
-                INSERT INTO collection_logs 
-                (source_name, operation, records_collected, status, error_message, duration_seconds)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                "Zambian_Market_Data",
-                operation,
-                records_collected,
-                status,
-                error_message,
-                duration
-            ))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            print(f"Error logging collection: {e}")
+        """Queue a data collection log row (written by _flush_logs())"""
+        self._queue_log("collection_logs", (
+            "Zambian_Market_Data",
+            operation,
+            records_collected,
+            status,
+            error_message,
+            duration,
+            datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")  # same as CURRENT_TIMESTAMP
+        ))
     
     def _log_system_activity(self, action: str, details: str = None):
-        """Log system activity - creates table if needed"""
-        try:
-            conn = self._get_db_connection()
-            cur = conn.cursor()
-            
-            # Create table if it doesn't exist
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS activity_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user TEXT,
-                    action TEXT,
-                    details TEXT,
-                    ip_address TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            cur.execute("""
-                INSERT INTO activity_logs (user, action, details, ip_address, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                "system",
-                action,
-                details,
-                "127.0.0.1",
-                datetime.now().isoformat()
-            ))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            print(f"Error logging system activity: {e}")
+        """Queue a system activity log row (written by _flush_logs())"""
+        self._queue_log("activity_logs", (
+            "system",
+            action,
+            details,
+            "127.0.0.1",
+            datetime.now().isoformat()
+        ))
     
-    def _notify_admin(self, message: str):
-        """Send notification to admin - creates table if needed"""
+    def _notify_admin(self, message: str, coalesce: bool = True):
+        """Send notification to admin (stored by _flush_logs()); repeats within _NOTIFY_TTL are dropped"""
+        if coalesce:
+            key = hashlib.blake2b(message.encode(), digest_size=8).hexdigest()
+            now = time.monotonic()
+            if self._notify_cache.get(key, float('-inf')) > now - _NOTIFY_TTL:
+                return
+            if len(self._notify_cache) > 1000:
+                # Forget expired entries so an error storm with varying text can't grow this forever
+                self._notify_cache = {k: t for k, t in self._notify_cache.items() if t > now - _NOTIFY_TTL}
+            self._notify_cache[key] = now
+        
         print(f"🔔 Admin Notification: {message}")
         
+        self._queue_log("admin_notifications", (
+            message,
+            'data_collection',
+            datetime.now().isoformat()
+        ))
+    
+    def _queue_log(self, table: str, row: tuple):
+        """Queue a log/notification row; a long job flushes every LOG_FLUSH_BATCH rows"""
+        self._log_queue.put((table, row))
+        if self._log_queue.qsize() >= LOG_FLUSH_BATCH:
+            self._flush_logs()
+    
+    def _flush_logs(self):
+        """Write every queued log/notification row in one transaction"""
+        pending = {}
         try:
-            conn = self._get_db_connection()
-            cur = conn.cursor()
-            
-            # Create table if it doesn't exist
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS admin_notifications (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    message TEXT NOT NULL,
-                    type TEXT DEFAULT 'info',
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    read_status INTEGER DEFAULT 0
-                )
-            """)
-            
-            cur.execute("""
-                INSERT INTO admin_notifications (message, type, created_at)
-                VALUES (?, ?, ?)
-            """, (
-                message,
-                'data_collection',
-                datetime.now().isoformat()
-            ))
-            
-            conn.commit()
-            conn.close()
-            
+            while True:
+                table, row = self._log_queue.get_nowait()
+                pending.setdefault(table, []).append(row)
+        except queue.Empty:
+            pass
+        
+        if not pending:
+            return 0
+        
+        try:
+            with self._db() as conn:
+                # Create tables if they don't exist (once per connection)
+                if not self._log_tables_ready:
+                    for table_sql in LOG_TABLES_SQL:
+                        conn.execute(table_sql)
+                    self._log_tables_ready = True
+                
+                conn.execute("BEGIN")
+                for table, rows in pending.items():
+                    conn.executemany(LOG_INSERT_SQL[table], rows)
+                conn.commit()
         except Exception as e:
-            print(f"Error logging admin notification: {e}")
+            print(f"Error writing activity logs: {e}")
+            return 0
+        
+        return sum(len(rows) for rows in pending.values())
     
     def _cleanup_old_backups(self):
         """Clean up old backup files"""
         try:
-            backup_files = []
-            
-            for filename in os.listdir(self.backup_dir):
-                if filename.endswith('.zip'):
-                    filepath = os.path.join(self.backup_dir, filename)
-                    backup_files.append({
-                        "path": filepath,
-                        "mtime": os.path.getmtime(filepath)
-                    })
+            # (path, mtime) pairs; scandir entries carry their stat, so no getmtime per file
+            with os.scandir(self.backup_dir) as it:
+                backup_files = [(entry.path, entry.stat().st_mtime) for entry in it
+                                if entry.name.endswith('.zip') and entry.is_file()]
             
             # Sort by modification time (oldest first)
-            backup_files.sort(key=lambda x: x["mtime"])
+            backup_files.sort(key=itemgetter(1))
             
             # Keep only last 30 backups
-            if len(backup_files) > 30:
-                files_to_remove = backup_files[:len(backup_files) - 30]
-                
-                for file_info in files_to_remove:
-                    try:
-                        os.remove(file_info["path"])
-                        print(f"🧹 Removed old backup: {os.path.basename(file_info['path'])}")
-                    except Exception as e:
-                        print(f"⚠️  Error removing backup: {e}")
+            for path, _ in backup_files[:-30]:
+                try:
+                    os.remove(path)
+                    print(f"🧹 Removed old backup: {os.path.basename(path)}")
+                except Exception as e:
+                    print(f"⚠️  Error removing backup: {e}")
+            
+            # Shrink the live database too: hand back up to 1000 free pages without the
+            # full rewrite a VACUUM would do (no-op unless auto_vacuum is INCREMENTAL)
+            with self._db() as conn:
+                conn.execute("PRAGMA incremental_vacuum(1000)").fetchall()
                         
         except Exception as e:
             print(f"Backup cleanup failed: {e}")
@@ -856,8 +1050,7 @@ class DataScheduler:
             
             # Save report
             report_path = os.path.join(self.log_dir, f"monthly_report_{month_year}.json")
-            with open(report_path, 'w') as f:
-                json.dump(report, f, indent=2)
+            _write_json_report(report_path, report)
             
             print(f"✅ Monthly report saved: {report_path}")
             
@@ -868,58 +1061,88 @@ class DataScheduler:
 # MOCK DATA CLASS FOR SIMULATION
 # =========================================================
 
+# Mock base prices (ZMW/kg)
+_BASE_PRICES = {
+    "Maize": 120.50,
+    "Tomatoes": 85.25,
+    "Beans": 175.30,
+    "Rice": 200.00,
+    "Groundnuts": 190.00,
+    "Onions": 105.00
+}
+
+# Mock market town -> region
+_MARKET_REGIONS = {
+    "Lusaka": "Lusaka",
+    "Kabwe": "Central",
+    "Ndola": "Copperbelt",
+    "Livingstone": "Southern"
+}
+
 class MockZambianData:
     """Mock data collector for simulation/testing"""
     
-    def fetch_all_sources(self):
-        """Generate mock market data"""
+    # fetch_all_sources() results are reused for this many seconds, so the ZNFU and
+    # MACO subsets of one collection run come from a single generated batch
+    CACHE_SECONDS = 5
+    
+    def __init__(self):
+        self._cache = None
+        self._cache_ts = 0.0
+    
+    def fetch_all_sources(self, as_tuples=False):
+        """Generate mock market data (as_tuples: rows in PRICE_ROW_FIELDS order)"""
+        if self._cache is not None and time.monotonic() - self._cache_ts < self.CACHE_SECONDS:
+            if as_tuples:
+                return [_price_row(price) for price in self._cache]
+            # Callers tag the records they get, so hand out copies
+            return [dict(price) for price in self._cache]
+        
+        import numpy as np
+        
         commodities = ["Maize", "Tomatoes", "Beans", "Rice", "Groundnuts", "Onions"]
         markets = ["Lusaka Central Market", "Kabwe Main Market", "Ndola Main Market", "Livingstone Market"]
         
-        prices = []
-        for commodity in commodities:
-            for market in markets:
-                base_price = {
-                    "Maize": 120.50,
-                    "Tomatoes": 85.25,
-                    "Beans": 175.30,
-                    "Rice": 200.00,
-                    "Groundnuts": 190.00,
-                    "Onions": 105.00
-                }.get(commodity, 100.00)
-                
-                # Add random variation
-                price = base_price * random.uniform(0.95, 1.05)
-                
-                prices.append({
-                    "market": market,
-                    "commodity": commodity,
-                    "price": round(price, 2),
-                    "unit": "ZMW/kg",
-                    "volume": random.randint(1000, 5000),
-                    "quality": random.choice(["Grade A", "Grade B", "Standard"]),
-                    "source": "Mock_Data",
-                    "verified": True,
-                    "recorded_at": datetime.now().isoformat(),
-                    "price_trend": random.choice(["up", "down", "stable"]),
-                    "region": self._get_region_from_market(market)
-                })
+        # Draw every random value for the commodity x market grid at once (commodity-major,
+        # the order the records have always come in), then build the dicts in one pass
+        rng = np.random.default_rng()
+        n = len(commodities) * len(markets)
+        base_prices = np.repeat([_BASE_PRICES.get(commodity, 100.00) for commodity in commodities], len(markets))
+        price_values = np.round(base_prices * rng.uniform(0.95, 1.05, n), 2).tolist()  # random variation
+        volumes = rng.integers(1000, 5000, n, endpoint=True).tolist()
+        qualities = rng.choice(["Grade A", "Grade B", "Standard"], n).tolist()
+        trends = rng.choice(["up", "down", "stable"], n).tolist()
+        recorded_at = datetime.now().isoformat()
+        regions = {market: self._get_region_from_market(market) for market in markets}
+        
+        prices = [{
+            "market": market,
+            "commodity": commodity,
+            "price": price,
+            "unit": "ZMW/kg",
+            "volume": volume,
+            "quality": quality,
+            "source": "Mock_Data",
+            "verified": True,
+            "recorded_at": recorded_at,
+            "price_trend": trend,
+            "region": regions[market]
+        } for (commodity, market), price, volume, quality, trend
+            in zip(product(commodities, markets), price_values, volumes, qualities, trends)]
         
         print(f"📊 Generated {len(prices)} mock price records")
-        return prices
+        self._cache = prices
+        self._cache_ts = time.monotonic()
+        if as_tuples:
+            return [_price_row(price) for price in prices]
+        return [dict(price) for price in prices]
     
-    def _get_region_from_market(self, market):
-        """Get region from market name"""
-        if "Lusaka" in market:
-            return "Lusaka"
-        elif "Kabwe" in market:
-            return "Central"
-        elif "Ndola" in market:
-            return "Copperbelt"
-        elif "Livingstone" in market:
-            return "Southern"
-        else:
-            return "Unknown"
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _get_region_from_market(market):
+        """Get region from market name (memoized - there are only a handful of markets)"""
+        # Market names start with their town ("Kabwe Main Market")
+        return _MARKET_REGIONS.get(market.split(" ", 1)[0], "Unknown")
     
     def fetch_znfu_prices(self):
         """Generate mock ZNFU prices"""
@@ -943,13 +1166,13 @@ class MockZambianData:
         commodities = ["Maize", "Tomatoes"]
         markets = ["Lusaka Central Market", "Kabwe Main Market"]
         
+        # One timestamp for the whole batch
+        now_iso = datetime.now().isoformat()
+        
         prices = []
         for commodity in commodities:
             for market in markets:
-                base_price = {
-                    "Maize": 120.50,
-                    "Tomatoes": 85.25
-                }.get(commodity, 100.00)
+                base_price = _BASE_PRICES.get(commodity, 100.00)
                 
                 # Small variation for hourly update
                 variation = random.uniform(-0.02, 0.02)
@@ -962,7 +1185,7 @@ class MockZambianData:
                     "unit": "ZMW/kg",
                     "source": "Mock_Hourly",
                     "verified": True,
-                    "recorded_at": datetime.now().isoformat(),
+                    "recorded_at": now_iso,
                     "region": self._get_region_from_market(market)
                 })
         
@@ -976,7 +1199,16 @@ def initialize_database_schema():
     """Initialize database with correct schema"""
     print("🔧 Initializing database schema...")
     
-    conn = sqlite3.connect('farm_market.db')
+    conn = sqlite3.connect(DATABASE)
+    
+    # Freed pages go to a free list that incremental_vacuum can trim later; only takes
+    # effect on a brand-new database (before the first table and before switching to WAL)
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    
+    if DATABASE != ':memory:':
+        # journal_mode=WAL is stored in the database file, so every later connection
+        # (including the Flask app's) inherits it
+        _apply_pragmas(conn)
     cur = conn.cursor()
     
     # Create market_prices table with all required columns
@@ -1001,43 +1233,23 @@ def initialize_database_schema():
         )
     """)
     
-    # Create other required tables
-    tables = [
-        """CREATE TABLE IF NOT EXISTS admin_notifications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            message TEXT NOT NULL,
-            type TEXT DEFAULT 'info',
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            read_status INTEGER DEFAULT 0
-        )""",
-        
-        """CREATE TABLE IF NOT EXISTS collection_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            source_name TEXT,
-            operation TEXT,
-            records_collected INTEGER,
-            status TEXT,
-            error_message TEXT,
-            duration_seconds REAL,
-            collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )""",
-        
-        """CREATE TABLE IF NOT EXISTS activity_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user TEXT,
-            action TEXT,
-            details TEXT,
-            ip_address TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )"""
-    ]
+    # Price lookups by commodity over time (same index app.init_db creates; the
+    # UNIQUE(market, commodity, recorded_at) autoindex already serves market+commodity)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_market_prices_commodity_recorded ON market_prices(commodity, recorded_at)")
     
-    for table_sql in tables:
+    # Create other required tables (the scheduler's log/notification tables)
+    for table_sql in LOG_TABLES_SQL:
         try:
             cur.execute(table_sql)
         except Exception as e:
             print(f"⚠️  Error creating table: {e}")
     
+    try:
+        cur.execute(PRICE_UPSERT_INDEX_SQL)
+    except sqlite3.IntegrityError as e:
+        print(f"⚠️  Could not create unique price index: {e}")
+    _create_indexes(conn)
+    
     conn.commit()
     conn.close()
     print("✅ Database schema initialized")
@@ -1054,12 +1266,41 @@ if __name__ == "__main__":
     # Initialize database schema first
     initialize_database_schema()
     
+    import selectors
+    import sys
+    
     # Create scheduler instance
     scheduler = DataScheduler()
     
+    # On POSIX the main thread waits on stdin and the next job at once, so no scheduler
+    # thread is needed; select() can't watch console input on Windows, so there the
+    # jobs keep their background thread and commands use a blocking input()
+    use_selector = os.name != 'nt'
+    if use_selector:
+        selector = selectors.DefaultSelector()
+        try:
+            selector.register(sys.stdin, selectors.EVENT_READ)
+        except (PermissionError, OSError, ValueError):
+            # stdin is a regular file or /dev/null (epoll can't watch those): use input()
+            selector.close()
+            use_selector = False
+    
+    def read_command():
+        """Wait for the next command, running scheduled jobs as they fall due"""
+        if not use_selector:
+            try:
+                return input("\nEnter command: ")
+            except EOFError:
+                return "exit"  # end of piped commands
+        
+        print("\nEnter command: ", end="", flush=True)
+        while True:
+            if selector.select(timeout=scheduler.run_due_jobs()):
+                return sys.stdin.readline() or "exit"  # EOF (Ctrl+D) quits
+    
     try:
         # Start the scheduler
-        scheduler.start_scheduler()
+        scheduler.start_scheduler(background=not use_selector)
         
         # Keep main thread alive
         print("\n🔄 Scheduler is running. Press Ctrl+C to stop.")
@@ -1074,7 +1315,7 @@ if __name__ == "__main__":
         print("  - Type 'exit' to quit")
         
         while True:
-            command = input("\nEnter command: ").strip().lower()
+            command = read_command().strip().lower()
             
             if command == 'daily':
                 scheduler.run_once_now("daily")
@@ -1090,7 +1331,7 @@ if __name__ == "__main__":
                 print("📊 Scheduler Status:")
                 print(f"   Running: {scheduler.running}")
                 print(f"   Next jobs:")
-                for job in schedule.get_jobs()[:5]:
+                for job in scheduler._job_refs[:5]:
                     print(f"     • {job}")
             elif command == 'stop':
                 scheduler.stop_scheduler()
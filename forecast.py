@@ -14,9 +14,13 @@ import os
 import warnings
 import hashlib
 import joblib
-from typing import Dict, List, Optional, Tuple, Union
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Union
 
-warnings.filterwarnings('ignore')
+# Silence scikit-learn's deprecation/fit chatter only; warnings from other modules still show
+warnings.filterwarnings('ignore', category=FutureWarning, module='sklearn')
+warnings.filterwarnings('ignore', category=UserWarning, module='sklearn')
 
 # Machine Learning Imports
 try:
@@ -34,6 +38,79 @@ except ImportError:
 # CONFIGURATION CLASSES - Compatible with app.py
 # =========================================================
 
+# Markets compared by the multi-market forecast (fixed at startup)
+FORECAST_MARKETS = ("Lusaka", "Kabwe", "Ndola", "Livingstone")
+
+# Forecast lookup tables, built once (ForecastConfig reads them on every forecast day);
+# read-only views, since callers share them
+_COMMODITY_SETTINGS = MappingProxyType({
+    "Maize": MappingProxyType({
+        "model": "ensemble",
+        "seasonality": 7,
+        "volatility": 0.08,
+        "default_price": 120.50,
+        "harvest_effect": -0.15,
+        "lean_effect": 0.20,
+    }),
+    "Tomatoes": MappingProxyType({
+        "model": "random_forest",
+        "seasonality": 7,
+        "volatility": 0.25,
+        "default_price": 85.25,
+        "rainy_effect": 0.30,
+        "dry_effect": -0.15,
+    }),
+    "Beans": MappingProxyType({
+        "model": "linear",
+        "seasonality": 30,
+        "volatility": 0.10,
+        "default_price": 175.30,
+        "export_effect": 0.25,
+    }),
+    "Rice": MappingProxyType({
+        "model": "ensemble",
+        "seasonality": 30,
+        "volatility": 0.05,
+        "default_price": 200.00,
+        "import_effect": 0.10,
+    }),
+    "Groundnuts": MappingProxyType({
+        "model": "ensemble",
+        "seasonality": 14,
+        "volatility": 0.12,
+        "default_price": 190.00,
+        "export_premium": 0.30,
+    }),
+})
+
+_DEFAULT_COMMODITY_CONFIG = MappingProxyType({
+    "model": "ensemble",
+    "seasonality": 7,
+    "volatility": 0.10,
+    "default_price": 100.00,
+})
+
+# Market location adjustment factors
+_MARKET_FACTORS = MappingProxyType({
+    "Lusaka": 1.05,
+    "Kabwe": 1.02,
+    "Ndola": 1.03,
+    "Livingstone": 1.00,
+    "Copperbelt": 1.03,
+    "Southern": 1.00,
+    "Eastern": 0.98,
+    "Central": 0.96,
+    "Northern": 0.97,
+})
+
+# Seasonal adjustment factors by month (January first)
+_SEASONAL_FACTORS = MappingProxyType({
+    # Harvest season (Apr-Jun) and lean season (Aug-Oct)
+    "Maize": (1.0, 1.0, 1.0, 0.92, 0.92, 0.92, 1.0, 1.15, 1.15, 1.15, 1.0, 1.0),
+    # Rainy season (Oct-Jan)
+    "Tomatoes": (1.20, 0.90, 0.90, 0.90, 0.90, 0.90, 0.90, 0.90, 0.90, 1.20, 1.20, 1.20),
+})
+
 class ForecastConfig:
     """Configuration for forecasting - compatible with app.py"""
     
@@ -42,84 +119,20 @@ class ForecastConfig:
         self.confidence_threshold = 0.7
     
     @staticmethod
-    def get_commodity_config(commodity: str) -> dict:
+    def get_commodity_config(commodity: str) -> Mapping:
         """Get configuration for specific commodity"""
-        commodity_settings = {
-            "Maize": {
-                "model": "ensemble",
-                "seasonality": 7,
-                "volatility": 0.08,
-                "default_price": 120.50,
-                "harvest_effect": -0.15,
-                "lean_effect": 0.20,
-            },
-            "Tomatoes": {
-                "model": "random_forest",
-                "seasonality": 7,
-                "volatility": 0.25,
-                "default_price": 85.25,
-                "rainy_effect": 0.30,
-                "dry_effect": -0.15,
-            },
-            "Beans": {
-                "model": "linear",
-                "seasonality": 30,
-                "volatility": 0.10,
-                "default_price": 175.30,
-                "export_effect": 0.25,
-            },
-            "Rice": {
-                "model": "ensemble",
-                "seasonality": 30,
-                "volatility": 0.05,
-                "default_price": 200.00,
-                "import_effect": 0.10,
-            },
-            "Groundnuts": {
-                "model": "ensemble",
-                "seasonality": 14,
-                "volatility": 0.12,
-                "default_price": 190.00,
-                "export_premium": 0.30,
-            },
-        }
-        return commodity_settings.get(commodity, {
-            "model": "ensemble",
-            "seasonality": 7,
-            "volatility": 0.10,
-            "default_price": 100.00,
-        })
+        return _COMMODITY_SETTINGS.get(commodity, _DEFAULT_COMMODITY_CONFIG)
     
     @staticmethod
     def get_market_factor(market: str) -> float:
         """Get market location adjustment factor"""
-        market_factors = {
-            "Lusaka": 1.05,
-            "Kabwe": 1.02,
-            "Ndola": 1.03,
-            "Livingstone": 1.00,
-            "Copperbelt": 1.03,
-            "Southern": 1.00,
-            "Eastern": 0.98,
-            "Central": 0.96,
-            "Northern": 0.97,
-        }
-        return market_factors.get(market, 1.0)
+        return _MARKET_FACTORS.get(market, 1.0)
     
     @staticmethod
     def get_seasonal_factor(month: int, commodity: str) -> float:
         """Get seasonal adjustment factor"""
-        if commodity == "Maize":
-            if month in [4, 5, 6]:  # Harvest season
-                return 0.92
-            elif month in [8, 9, 10]:  # Lean season
-                return 1.15
-        elif commodity == "Tomatoes":
-            if month in [10, 11, 12, 1]:  # Rainy season
-                return 1.20
-            else:
-                return 0.90
-        return 1.0
+        factors = _SEASONAL_FACTORS.get(commodity)
+        return factors[month - 1] if factors else 1.0
 
 # =========================================================
 # MODEL MANAGER CLASS
@@ -128,20 +141,38 @@ class ForecastConfig:
 class ModelManager:
     """Manage forecasting models"""
     
+    # Every model lives in one archive: one file open and write per save instead of one per model
+    ARCHIVE_NAME = "all_models.pkl"
+    
     def __init__(self):
         self.models = {}
         self.model_dir = "models"
+        self.archive_path = os.path.join(self.model_dir, self.ARCHIVE_NAME)
+        self._archive_loaded = False
+        self._dirty_keys = set()  # models to persist on the next save_models()
         
         # Create model directory if it doesn't exist
         if not os.path.exists(self.model_dir):
             os.makedirs(self.model_dir)
     
+    def _load_archive(self):
+        """Load the model archive once, on first use"""
+        self._archive_loaded = True
+        if os.path.exists(self.archive_path):
+            try:
+                self.models.update(joblib.load(self.archive_path))
+            except Exception as e:
+                print(f"⚠️  Could not load model archive: {e}")
+    
     def get_model(self, commodity, market):
         """Get or create model for commodity-market pair"""
         model_key = f"{commodity}_{market}"
         
+        if not self._archive_loaded:
+            self._load_archive()
+        
         if model_key not in self.models:
-            # Try to load from disk
+            # Older installs saved one file per model: pick it up into the archive
             model_path = os.path.join(self.model_dir, f"{model_key}.pkl")
             if os.path.exists(model_path):
                 try:
@@ -151,6 +182,8 @@ class ModelManager:
             else:
                 self.models[model_key] = self._create_new_model()
         
+        # Callers may refit the model they get, so it's saved with the next archive
+        self._dirty_keys.add(model_key)
         return self.models[model_key]
     
     def _create_new_model(self):
@@ -158,10 +191,14 @@ class ModelManager:
         return LinearRegression()
     
     def save_models(self):
-        """Save all models to disk"""
-        for model_key, model in self.models.items():
-            model_path = os.path.join(self.model_dir, f"{model_key}.pkl")
-            joblib.dump(model, model_path)
+        """Save all models to disk (one compressed archive, rewritten only when a model changed)"""
+        if not self._dirty_keys:
+            return
+        
+        tmp_path = f"{self.archive_path}.tmp"
+        joblib.dump(self.models, tmp_path, compress=3)
+        os.replace(tmp_path, self.archive_path)
+        self._dirty_keys.clear()
 
 # =========================================================
 # CORE FORECASTING FUNCTIONS
@@ -534,10 +571,13 @@ def get_market_forecast(commodity, market, days):
     """
     Get forecast for specific market - Required by app.py
     """
+    # Load data from database
+    df = load_commodity_data_from_db(commodity, market)
+    return forecast_from_history(df, commodity, market, days)
+
+def forecast_from_history(df, commodity, market, days):
+    """Forecast one market from already-loaded price history"""
     try:
-        # Load data from database
-        df = load_commodity_data_from_db(commodity, market)
-        
         if df.empty or len(df) < 2:
             # Fallback to context-aware forecast
             config = ForecastConfig.get_commodity_config(commodity)
@@ -559,12 +599,14 @@ def get_all_markets_forecast(commodity, days):
     """
     Get forecasts for all markets - Required by app.py
     """
-    markets = ["Lusaka", "Kabwe", "Ndola", "Livingstone"]
     results = {}
     
-    for market in markets:
+    # One query for every market instead of one per market
+    history = load_markets_data_from_db(commodity, FORECAST_MARKETS)
+    
+    for market in FORECAST_MARKETS:
         try:
-            forecast = get_market_forecast(commodity, market, days)
+            forecast = forecast_from_history(history.get(market, pd.DataFrame()), commodity, market, days)
             results[market] = forecast
         except Exception as e:
             results[market] = {
@@ -743,6 +785,47 @@ def load_commodity_data_from_db(commodity, market=None, days_back=90):
         print(f"Error loading data for {commodity}: {e}")
         return pd.DataFrame()
 
+@lru_cache(maxsize=8)
+def _markets_history_query(market_count):
+    """Build the bucketed multi-market history query once per market count"""
+    # Tag each row with the first market it matches, keep the latest N per market
+    bucket = " ".join("WHEN market LIKE ? THEN ?" for _ in range(market_count))
+    return f"""
+        SELECT bucket, price, recorded_at FROM (
+            SELECT CASE {bucket} END AS bucket, price, recorded_at,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY CASE {bucket} END
+                       ORDER BY recorded_at DESC
+                   ) AS rn
+            FROM market_prices
+            WHERE commodity = ?
+                AND verified = 1
+        )
+        WHERE bucket IS NOT NULL AND rn <= ?
+        ORDER BY bucket, recorded_at DESC
+    """
+
+def load_markets_data_from_db(commodity, markets, days_back=90):
+    """Load commodity history for several markets in one query (dict of DataFrames)"""
+    try:
+        conn = sqlite3.connect("farm_market.db")
+        
+        query = _markets_history_query(len(markets))
+        bucket_params = [p for market in markets for p in (f"%{market}%", market)]
+        params = bucket_params + bucket_params + [commodity, days_back]
+        
+        df = pd.read_sql_query(query, conn, params=params)
+        conn.close()
+        
+        return {
+            market: group.drop(columns="bucket").reset_index(drop=True)
+            for market, group in df.groupby("bucket", sort=False)
+        }
+        
+    except Exception as e:
+        print(f"Error loading market data for {commodity}: {e}")
+        return {}
+
 # =========================================================
 # INITIALIZE MODEL MANAGER
 # =========================================================
@@ -0,0 +1,22 @@
+# =========================================================
+# gunicorn.conf.py - Production server settings
+# Usage: gunicorn -c gunicorn.conf.py app:app
+# =========================================================
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:5000")
+
+# gevent workers let requests waiting on Twilio, S3 or the database
+# yield to each other instead of holding a whole worker
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+# Read by app.py: with more than one worker the response cache needs REDIS_URL
+# (the in-process fallback can't see other workers' invalidations and is turned off)
+os.environ["GUNICORN_WORKERS"] = str(workers)
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 1000))
+
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, func
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -14,5 +14,10 @@ class Price(Base):
     recorded_at = Column(Date, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_price_commodity_market_recorded", "commodity", "market", "recorded_at"),
+        Index("ix_price_recorded", "recorded_at"),
+    )
+
     def __repr__(self):
         return f"<Price({self.market}, {self.commodity}, {self.price})>"
@@ -1,7 +1,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from models import Base, Price
-import pandas as pd
+from datetime import date
 
 DB_USER = "root"
 DB_HOST = "127.0.0.1"
@@ -26,13 +26,14 @@ data = [
     {"market": "Lusaka", "commodity": "Tomatoes", "price": 7.0, "volume": 300},
 ]
 
+today = date.today()
 for d in data:
     price = Price(
         market=d["market"],
         commodity=d["commodity"],
         price=d["price"],
         volume=d["volume"],
-        recorded_at=pd.Timestamp.now().date(),
+        recorded_at=today,
     )
     session.add(price)
 
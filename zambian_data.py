@@ -236,12 +236,18 @@ class ZambianMarketData:
         try:
             print("📊 Fetching ZNFU market data...")
             
-            current_month = datetime.now().month
+            # Read the clock once for the whole batch
+            now = datetime.now()
+            now_iso = now.isoformat()
+            current_month = now.month
             season_info = ZambianMarketData.SEASONAL_CALENDAR.get(current_month, {})
             
             markets = ZambianMarketData.ZAMBIAN_MARKETS["Lusaka"]["markets"][:3]
             commodities = ["Maize", "Tomatoes", "Beans", "Rice", "Groundnuts", "Onions"]
             
+            # Daily variation (-2% to +3%)
+            daily_variation = 1 + (now.day % 14 - 7) * 0.003
+            
             prices = []
             for market_info in markets:
                 market = market_info["name"]
@@ -271,9 +277,6 @@ class ZambianMarketData:
                             else:
                                 seasonal_factor = 0.90
                         
-                        # Daily variation (-2% to +3%)
-                        daily_variation = 1 + (datetime.now().day % 14 - 7) * 0.003
-                        
                         # Calculate final price
                         price = base_price * market_factor * seasonal_factor * daily_variation
                         price = round(price, 2)
@@ -301,7 +304,7 @@ class ZambianMarketData:
                             "quality": random.choices(qualities, weights=weights)[0],
                             "source": "ZNFU",
                             "verified": True,
-                            "recorded_at": datetime.now().isoformat(),
+                            "recorded_at": now_iso,
                             "market_lat": market_info.get("lat"),
                             "market_lon": market_info.get("lon"),
                             "season": season_info.get("name", "unknown"),
@@ -324,6 +327,11 @@ class ZambianMarketData:
             regions = ["Copperbelt", "Southern", "Eastern", "Central", "Northern"]
             commodities = ["Maize", "Beans", "Groundnuts", "Rice", "Tomatoes", "Potatoes"]
             
+            # Read the clock once for the whole batch (seasonal adjustment uses the month)
+            now = datetime.now()
+            now_iso = now.isoformat()
+            month = now.month
+            
             prices = []
             for region in regions[:3]:  # Limit to 3 regions
                 region_data = ZambianMarketData.ZAMBIAN_MARKETS.get(region)
@@ -352,7 +360,6 @@ class ZambianMarketData:
                             region_factor = region_factors.get(region, 1.0)
                             
                             # Seasonal adjustment
-                            month = datetime.now().month
                             seasonal_factor = ZambianMarketData.get_seasonal_factor(commodity, month)
                             
                             price = base_price * region_factor * seasonal_factor
@@ -366,7 +373,7 @@ class ZambianMarketData:
                                 "volume": random.randint(500, 3000),
                                 "source": f"MACO_{region}",
                                 "verified": True,
-                                "recorded_at": datetime.now().isoformat(),
+                                "recorded_at": now_iso,
                                 "region": region,
                                 "market_days": region_data.get("market_days", []),
                                 "contact": region_data.get("contact", "")
@@ -455,6 +462,7 @@ class ZambianMarketData:
             conn = sqlite3.connect('farm_market.db')
             conn.row_factory = sqlite3.Row
             cur = conn.cursor()
+            now_iso = datetime.now().isoformat()
             
             for source_name, stats in source_stats.items():
                 # Find source ID
@@ -471,7 +479,7 @@ class ZambianMarketData:
                             total_attempts = total_attempts + 1,
                             total_success = total_success + ?
                         WHERE id = ?
-                    ''', (datetime.now().isoformat(), 1 if stats["status"] == "success" else 0, source_id))
+                    ''', (now_iso, 1 if stats["status"] == "success" else 0, source_id))
             
             conn.commit()
             conn.close()